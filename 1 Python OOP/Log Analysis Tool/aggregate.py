@@ -0,0 +1,291 @@
+import heapq
+import itertools
+import re
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Optional
+
+from init import LogEntry, timer, memory_tracker, log_reader
+from parallel import _plan, read_range
+from templates import WILDCARD
+
+PREFIX_WORDS = 3
+_NUMBERED = re.compile(r"\S*\d\S*")
+
+
+# ─────────────────────────────────────────────
+#  Group state
+# ─────────────────────────────────────────────
+@dataclass
+class GroupStats:
+    count: int = 0
+    first: Optional[str] = None
+    last: Optional[str] = None
+    error: int = 0                  # Space-Saving overestimate; 0 for exact groups
+
+    def add(self, stamp: str) -> None:
+        self.count += 1
+        if self.first is None or stamp < self.first:
+            self.first = stamp
+        if self.last is None or stamp > self.last:
+            self.last = stamp
+
+    def merge(self, other: "GroupStats") -> None:
+        self.count += other.count
+        self.error += other.error
+        if other.first is not None and (self.first is None or other.first < self.first):
+            self.first = other.first
+        if other.last is not None and (self.last is None or other.last > self.last):
+            self.last = other.last
+
+
+class SpaceSaving:
+    """Top-k heavy hitters in fixed memory (Metwally et al., Space-Saving).
+
+    At most `capacity` keys are tracked. A new key evicts the smallest one
+    and inherits its count as error, so each count overestimates by at most
+    its `error`, and any key seen more than n / capacity times is tracked.
+    """
+
+    def __init__(self, capacity: int):
+        if not isinstance(capacity, int) or isinstance(capacity, bool):
+            raise TypeError("Capacity must be an integer.")
+        if capacity < 1:
+            raise ValueError("Capacity must be at least 1.")
+        self.capacity = capacity
+        self.groups: dict = {}
+        self._heap: list = []           # (count, seq, key), refreshed lazily on eviction
+        self._seq = itertools.count()
+
+    def add(self, key, stamp: str) -> None:
+        groups = self.groups
+        stats = groups.get(key)
+        if stats is None:
+            if len(groups) < self.capacity:
+                stats = groups[key] = GroupStats()
+            else:
+                evicted = groups.pop(self._pop_smallest())
+                stats = groups[key] = GroupStats(count=evicted.count, error=evicted.count)
+            heapq.heappush(self._heap, (stats.count, next(self._seq), key))
+        stats.add(stamp)
+
+    def _pop_smallest(self):
+        heap, groups = self._heap, self.groups
+        while True:
+            count, _, key = heap[0]
+            current = groups[key].count
+            if current == count:
+                heapq.heappop(heap)
+                return key
+            heapq.heapreplace(heap, (current, next(self._seq), key))
+
+    def merge(self, other: "SpaceSaving") -> None:
+        """Fold another summary in; a key missing on one side is charged that side's minimum."""
+        def floor(summary: "SpaceSaving") -> int:
+            if len(summary.groups) < summary.capacity:
+                return 0                # not full: absent keys really were never seen
+            return min(stats.count for stats in summary.groups.values())
+
+        floor_self, floor_other = floor(self), floor(other)
+        merged: dict = {}
+        for key in self.groups.keys() | other.groups.keys():
+            stats = GroupStats()
+            for groups, missing in ((self.groups, floor_self), (other.groups, floor_other)):
+                if key in groups:
+                    stats.merge(groups[key])
+                else:
+                    stats.count += missing
+                    stats.error += missing
+            merged[key] = stats
+        kept = sorted(merged.items(), key=lambda item: item[1].count, reverse=True)
+        self.groups = dict(kept[:self.capacity])
+        self._heap = [(stats.count, next(self._seq), key) for key, stats in self.groups.items()]
+        heapq.heapify(self._heap)
+
+    def top(self, n: Optional[int] = None) -> list:
+        ranked = sorted(self.groups.items(), key=lambda item: item[1].count, reverse=True)
+        return ranked if n is None else ranked[:n]
+
+    def __getstate__(self):
+        return {"capacity": self.capacity, "groups": self.groups}
+
+    def __setstate__(self, state):
+        self.__init__(state["capacity"])
+        for key, stats in state["groups"].items():
+            self.groups[key] = stats
+            heapq.heappush(self._heap, (stats.count, next(self._seq), key))
+
+
+# ─────────────────────────────────────────────
+#  Aggregator
+# ─────────────────────────────────────────────
+def key_getter(key):
+    """Function extracting a grouping key: a field name, a tuple of them, "prefix" or "shape"."""
+    if key == "prefix":
+        return lambda entry: " ".join(entry.message.split(None, PREFIX_WORDS)[:PREFIX_WORDS])
+    if key == "shape":
+        # any word containing a digit becomes a wildcard — a cheap stand-in for the mined template
+        return lambda entry: _NUMBERED.sub(WILDCARD, entry.message)
+    if isinstance(key, tuple):
+        return lambda entry: tuple(getattr(entry, name) for name in key)
+    return lambda entry: getattr(entry, key)
+
+
+class Aggregator:
+    """Single-pass group-by over a LogEntry stream.
+
+    `exact` keys keep one GroupStats per distinct value, so they grow with
+    the number of values — meant for small, fixed domains like level.
+    `top_k` keys go through a Space-Saving summary of the given size, so
+    pid, tag or message-prefix counts stay bounded however many distinct
+    values the log has; the defaults keep memory bounded throughout. A key is
+    a LogEntry field name, a tuple of field names, "prefix" for the first
+    PREFIX_WORDS words of the message, or "shape" for the message with
+    every word containing a digit replaced by a wildcard.
+    """
+
+    DEFAULT_EXACT = ("level",)
+    DEFAULT_TOP_K = {"pid": 256, "tag": 256, ("tag", "level"): 256, "prefix": 256}
+
+    ####################### Initialization #######################
+
+    def __init__(self, exact=DEFAULT_EXACT, top_k: Optional[dict] = None):
+        if top_k is None:
+            top_k = dict(self.DEFAULT_TOP_K)
+        self.exact: dict = {key: {} for key in exact}
+        self.top_k: dict = {key: SpaceSaving(size) for key, size in top_k.items()}
+        self.total = GroupStats()
+        self._getters = None
+
+    def _bind(self):
+        self._getters = (
+            [(key, key_getter(key), groups) for key, groups in self.exact.items()],
+            [(key_getter(key), summary) for key, summary in self.top_k.items()],
+        )
+        return self._getters
+
+    ####################### Consuming #######################
+
+    def add(self, entry: LogEntry) -> None:
+        exact, approximate = self._getters or self._bind()
+        stamp = f"{entry.date} {entry.time}"
+        self.total.add(stamp)
+        for _, get, groups in exact:
+            value = get(entry)
+            stats = groups.get(value)
+            if stats is None:
+                stats = groups[value] = GroupStats()
+            stats.add(stamp)
+        for get, summary in approximate:
+            summary.add(get(entry), stamp)
+
+    def consume(self, entries) -> "Aggregator":
+        for entry in entries:
+            self.add(entry)
+        return self
+
+    def merge(self, other: "Aggregator") -> "Aggregator":
+        if self.exact.keys() != other.exact.keys() or self.top_k.keys() != other.top_k.keys():
+            raise ValueError("Cannot merge aggregators with different keys.")
+        self.total.merge(other.total)
+        for key, groups in other.exact.items():
+            mine = self.exact[key]
+            for value, stats in groups.items():
+                if value in mine:
+                    mine[value].merge(stats)
+                else:
+                    mine[value] = stats
+        for key, summary in other.top_k.items():
+            self.top_k[key].merge(summary)
+        return self
+
+    ####################### Results #######################
+
+    def groups(self, key) -> list:
+        """(value, GroupStats) pairs for one key, largest count first."""
+        if key in self.exact:
+            return sorted(self.exact[key].items(), key=lambda item: item[1].count, reverse=True)
+        if key in self.top_k:
+            return self.top_k[key].top()
+        raise KeyError(f"Not aggregated: {key!r}")
+
+    def report(self, n: int = 5) -> str:
+        lines = [f"  Entries : {self.total.count}  ({self.total.first} → {self.total.last})"]
+        for key in [*self.exact, *self.top_k]:
+            approximate = key in self.top_k
+            lines.append(f"  ── by {key}{' (top-k)' if approximate else ''}")
+            for value, stats in self.groups(key)[:n]:
+                bound = f" ±{stats.error}" if approximate and stats.error else ""
+                lines.append(f"     {str(value):<40} {stats.count:>9}{bound}")
+        return "\n".join(lines)
+
+    def __getstate__(self):
+        return {"exact": self.exact, "top_k": self.top_k, "total": self.total}
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._getters = None
+
+
+# ─────────────────────────────────────────────
+#  Parallel aggregation
+# ─────────────────────────────────────────────
+def _aggregate_range(filename: str, start: int, end: int, exact, top_k) -> Aggregator:
+    return Aggregator(exact, top_k).consume(read_range(filename, start, end))
+
+
+def parallel_aggregate(filename: str, workers: Optional[int] = None,
+                       exact=Aggregator.DEFAULT_EXACT, top_k: Optional[dict] = None) -> Aggregator:
+    """Aggregate newline-aligned chunks in a process pool and merge the partial results.
+
+    A compressed log cannot be split and is aggregated in one process.
+    """
+    if top_k is None:
+        top_k = dict(Aggregator.DEFAULT_TOP_K)
+    workers, ranges = _plan(filename, workers)
+    if ranges is None:
+        return Aggregator(exact, top_k).consume(log_reader(filename))
+    result = Aggregator(exact, top_k)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(_aggregate_range, filename, start, end, exact, top_k)
+                   for start, end in ranges]
+        for future in futures:
+            result.merge(future.result())
+    return result
+
+
+# ─────────────────────────────────────────────
+#  Comparison functions
+# ─────────────────────────────────────────────
+@timer
+@memory_tracker
+def approach_aggregate(filename: str) -> Aggregator:
+    """One streaming pass with bounded group state."""
+    return Aggregator().consume(log_reader(filename))
+
+
+@timer
+@memory_tracker
+def approach_parallel_aggregate(filename: str) -> Aggregator:
+    """Per-chunk aggregators in worker processes, merged at the end."""
+    return parallel_aggregate(filename)
+
+
+# ─────────────────────────────────────────────
+#  Run comparison
+# ─────────────────────────────────────────────
+FILE = "./datasets/Android.log"
+
+if __name__ == "__main__":
+    print("=" * 50)
+    print("  AGGREGATE  (single pass)")
+    print("=" * 50)
+    result = approach_aggregate(FILE)
+    print(result.report())
+    print()
+
+    print("=" * 50)
+    print("  AGGREGATE  (parallel chunks, merged)")
+    print("=" * 50)
+    result = approach_parallel_aggregate(FILE)
+    print(f"  Entries : {result.total.count}\n")
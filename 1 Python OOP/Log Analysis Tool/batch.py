@@ -0,0 +1,210 @@
+import sys
+from array import array
+
+from init import DEFAULT_YEAR, LogEntry, TimestampDecoder, timer, memory_tracker, approach_list
+from mmap_reader import FIELDS, mmap_reader
+
+
+# ─────────────────────────────────────────────
+#  LogBatch
+# ─────────────────────────────────────────────
+class LogBatch:
+    """Columnar store for parsed entries — one array per field instead of one object per line.
+
+    pid/tid live in array('i'), level is a one-byte code (LogEntry.LEVELS,
+    extended on demand for other letters), dates and tags are interned ids,
+    and times/messages are UTF-8 slices of shared buffers addressed by end
+    offsets. epoch_ms holds each timestamp decoded once as integer epoch
+    milliseconds in the batch's year, or NO_TIME where the date does not
+    exist. Entries are rebuilt as LogEntry objects only when asked for.
+    """
+
+    ####################### Initialization #######################
+
+    def __init__(self, year: int = DEFAULT_YEAR):
+        self.pids = array("i")
+        self.tids = array("i")
+        self.levels = array("B")
+        self.tag_ids = array("I")
+        self.date_ids = array("H")
+        self.epoch_ms = array("q")
+        self._decoder = TimestampDecoder(year)
+
+        self._level_codes = dict(LogEntry.LEVELS)
+        self._level_names = {code: level for level, code in LogEntry.LEVELS.items()}
+        self._tag_codes: dict[str, int] = {}
+        self.tags: list[str] = []
+        self._date_codes: dict[str, int] = {}
+        self.dates: list[str] = []
+
+        self._times = bytearray()
+        self._time_ends = array("Q")
+        self._messages = bytearray()
+        self._message_ends = array("Q")
+
+    @classmethod
+    def from_entries(cls, entries, year: int = DEFAULT_YEAR) -> "LogBatch":
+        batch = cls(year)
+        batch.extend(entries)
+        return batch
+
+    @classmethod
+    def from_file(cls, filename: str, year: int = DEFAULT_YEAR) -> "LogBatch":
+        """Load a whole log straight from the mmap reader, skipping LogEntry construction."""
+        batch = cls(year)
+        append = batch.append_fields
+        for fields in mmap_reader(filename, fields=FIELDS):
+            append(*fields)
+        return batch
+
+    ####################### Building #######################
+
+    def append_fields(self, date: str, time: str, pid: int, tid: int,
+                      level: str, tag: str, message: str) -> None:
+        level_code = self._level_codes.get(level)
+        if level_code is None:
+            level_code = len(self._level_codes)
+            if level_code > 255:
+                raise ValueError("Too many distinct levels for a one-byte code.")
+            self._level_codes[level] = level_code
+            self._level_names[level_code] = level
+        tag_id = self._tag_codes.get(tag)
+        if tag_id is None:
+            tag_id = self._tag_codes[tag] = len(self.tags)
+            self.tags.append(tag)
+        date_id = self._date_codes.get(date)
+        if date_id is None:
+            date_id = self._date_codes[date] = len(self.dates)
+            self.dates.append(date)
+
+        self.pids.append(pid)
+        self.tids.append(tid)
+        self.levels.append(level_code)
+        self.tag_ids.append(tag_id)
+        self.date_ids.append(date_id)
+        self.epoch_ms.append(self._decoder.decode(date, time))
+        self._times += time.encode("ascii")
+        self._time_ends.append(len(self._times))
+        self._messages += message.encode("utf-8")
+        self._message_ends.append(len(self._messages))
+
+    def append(self, entry: LogEntry) -> None:
+        if not isinstance(entry, LogEntry):
+            raise TypeError("Entry must be a LogEntry.")
+        self.append_fields(entry.date, entry.time, entry.pid, entry.tid,
+                           entry.level, entry.tag, entry.message)
+
+    def extend(self, entries) -> None:
+        for entry in entries:
+            self.append(entry)
+
+    ####################### Column access #######################
+
+    @property
+    def year(self) -> int:
+        return self._decoder.year
+
+    @property
+    def level_names(self) -> list[str]:
+        """Level letter for each one-byte code, indexed by code."""
+        return [self._level_names[code] for code in range(len(self._level_names))]
+
+    def columns(self) -> dict:
+        """Every fixed-width column and text buffer, by name — what the binary cache stores."""
+        return {
+            "pids": self.pids,
+            "tids": self.tids,
+            "levels": self.levels,
+            "tag_ids": self.tag_ids,
+            "date_ids": self.date_ids,
+            "epoch_ms": self.epoch_ms,
+            "time_ends": self._time_ends,
+            "times": self._times,
+            "message_ends": self._message_ends,
+            "messages": self._messages,
+        }
+
+    def level(self, index: int) -> str:
+        return self._level_names[self.levels[index]]
+
+    def tag(self, index: int) -> str:
+        return self.tags[self.tag_ids[index]]
+
+    def date(self, index: int) -> str:
+        return self.dates[self.date_ids[index]]
+
+    def time(self, index: int) -> str:
+        start = self._time_ends[index - 1] if index else 0
+        return self._times[start:self._time_ends[index]].decode("ascii")
+
+    def message(self, index: int) -> str:
+        start = self._message_ends[index - 1] if index else 0
+        return self._messages[start:self._message_ends[index]].decode("utf-8")
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate memory held by the batch, including its intern tables."""
+        columns = (self.pids, self.tids, self.levels, self.tag_ids, self.date_ids, self.epoch_ms,
+                   self._times, self._time_ends, self._messages, self._message_ends)
+        total = sum(sys.getsizeof(column) for column in columns)
+        for table, names in ((self._tag_codes, self.tags), (self._date_codes, self.dates)):
+            total += sys.getsizeof(table) + sys.getsizeof(names)
+            total += sum(sys.getsizeof(name) for name in names)
+        return total
+
+    ####################### Magic Methods #######################
+
+    def __len__(self) -> int:
+        return len(self.pids)
+
+    def __getitem__(self, index: int) -> LogEntry:
+        if not isinstance(index, int) or isinstance(index, bool):
+            raise TypeError("Index must be an integer.")
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("LogBatch index out of range.")
+        return LogEntry(
+            date=self.date(index), time=self.time(index),
+            pid=self.pids[index], tid=self.tids[index],
+            level=self.level(index),
+            tag=self.tag(index),
+            message=self.message(index),
+        )
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+    def __repr__(self) -> str:
+        return f"LogBatch(entries={len(self)}, tags={len(self.tags)}, nbytes={self.nbytes})"
+
+
+# ─────────────────────────────────────────────
+#  Comparison functions
+# ─────────────────────────────────────────────
+@timer
+@memory_tracker
+def approach_batch(filename: str) -> int:
+    """Loads every entry into a columnar LogBatch — full file in RAM, no per-line objects."""
+    batch = LogBatch.from_file(filename)
+    return len(batch)
+
+
+# ─────────────────────────────────────────────
+#  Run comparison
+# ─────────────────────────────────────────────
+FILE = "./datasets/Android.log"
+
+if __name__ == "__main__":
+    print("=" * 50)
+    print("  LIST  (one LogEntry dataclass per line)")
+    print("=" * 50)
+    count = approach_list(FILE)
+    print(f"  Entries loaded    : {count}\n")
+
+    print("=" * 50)
+    print("  BATCH  (columnar arrays + shared buffers)")
+    print("=" * 50)
+    count = approach_batch(FILE)
+    print(f"  Entries loaded    : {count}\n")
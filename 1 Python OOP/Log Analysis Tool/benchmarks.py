@@ -0,0 +1,243 @@
+import argparse
+import gc
+import json
+import os
+import platform
+import re
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, Optional
+
+from init import LogEntry, TimestampDecoder, log_reader
+from aggregate import Aggregator
+from mmap_reader import mmap_reader
+from query import Query
+from stats import ReaderStats
+
+FILE = "./datasets/Android.log"
+QUERY = 'level>=W and tag in (ActivityManager, PowerManagerService) and msg~"timeout"'
+SIZES = (0.1, 0.5, 1.0)
+THRESHOLD = 0.10
+
+
+# ─────────────────────────────────────────────
+#  Cases
+# ─────────────────────────────────────────────
+@dataclass
+class Case:
+    """One benchmark: setup runs untimed, run does the measured work and returns items processed."""
+    name: str
+    group: str
+    run: Callable
+    setup: Callable = lambda filename: filename
+
+
+def _read_lines(filename: str) -> list[str]:
+    with open(filename, "r", encoding="utf-8", errors="replace") as file:
+        return [line.strip() for line in file]
+
+
+def _parse_all(lines: list[str], parse=LogEntry.parse_regex) -> int:
+    return sum(1 for line in lines if parse(line))
+
+
+def _parse_all_fast(lines: list[str]) -> int:
+    return _parse_all(lines, LogEntry.parse_fast)
+
+
+def _count(entries) -> int:
+    return sum(1 for _ in entries)
+
+
+def _read_stamps(filename: str) -> list[tuple[str, str]]:
+    return [(entry.date, entry.time) for entry in log_reader(filename)]
+
+
+def _strptime_all(stamps) -> int:
+    for date, time_ in stamps:
+        datetime.strptime(f"2000-{date} {time_}", "%Y-%m-%d %H:%M:%S.%f")
+    return len(stamps)
+
+
+def _lambda_chain(filename: str) -> int:
+    checks = [
+        lambda e: re.search("timeout", e.message) is not None,
+        lambda e: e.tag in ("ActivityManager", "PowerManagerService"),
+        lambda e: e.severity >= LogEntry.LEVELS["W"],
+    ]
+    return _count(entry for entry in log_reader(filename) if all(check(entry) for check in checks))
+
+
+def _decode_all(stamps) -> int:
+    decode = TimestampDecoder(2000).decode
+    for date, time_ in stamps:
+        decode(date, time_)
+    return len(stamps)
+
+
+CASES = [
+    Case("log_reader", "reader", lambda filename: _count(log_reader(filename))),
+    Case("log_reader[stats]", "reader",
+         lambda filename: _count(log_reader(filename, stats=ReaderStats()))),
+    Case("mmap_reader", "reader", lambda filename: _count(mmap_reader(filename))),
+    Case("mmap_reader[level,tag]", "reader",
+         lambda filename: _count(mmap_reader(filename, fields=("level", "tag")))),
+    Case("LogEntry.parse", "parser", _parse_all, setup=_read_lines),
+    Case("LogEntry.parse_fast", "parser", _parse_all_fast, setup=_read_lines),
+    Case("datetime.strptime", "timestamps", _strptime_all, setup=_read_stamps),
+    Case("TimestampDecoder", "timestamps", _decode_all, setup=_read_stamps),
+    Case("filter after parse", "filter",
+         lambda filename: _count(entry for entry in log_reader(filename)
+                                 if entry.severity >= LogEntry.LEVELS["W"])),
+    Case("filter pushdown", "filter",
+         lambda filename: _count(log_reader(filename, min_level="W"))),
+    Case("lambda chain", "query", _lambda_chain),
+    Case("compiled query", "query", lambda filename: Query(QUERY).count(filename)),
+    Case("Aggregator", "aggregation",
+         lambda filename: Aggregator().consume(log_reader(filename)).total.count),
+]
+
+
+# ─────────────────────────────────────────────
+#  Measuring
+# ─────────────────────────────────────────────
+def _time_case(case: Case, state, warmup: int, repeat: int) -> tuple[list[float], int]:
+    for _ in range(warmup):
+        case.run(state)
+    timings = []
+    items = 0
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        items = case.run(state)
+        timings.append(time.perf_counter() - start)
+    return timings, items
+
+
+def _peak_memory(case: Case, state) -> int:
+    """A separate traced run — tracemalloc slows allocation, so it never overlaps the timing runs."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        case.run(state)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak
+
+
+def make_inputs(filename: str, fractions, folder: str) -> dict[str, str]:
+    """Copies of the log cut to each fraction of its lines, keyed like '50%'."""
+    with open(filename, "rb") as file:
+        lines = file.readlines()
+    inputs = {}
+    for fraction in fractions:
+        label = f"{fraction:.0%}"
+        if fraction >= 1:
+            inputs[label] = filename
+            continue
+        path = os.path.join(folder, f"input-{label.rstrip('%')}.log")
+        with open(path, "wb") as file:
+            file.writelines(lines[:max(1, int(len(lines) * fraction))])
+        inputs[label] = path
+    return inputs
+
+
+def run_suite(filename: str, fractions=SIZES, warmup: int = 1, repeat: int = 5,
+              cases=None, only: Optional[str] = None) -> dict:
+    cases = [case for case in (cases or CASES) if only is None or case.group == only]
+    results = []
+    with tempfile.TemporaryDirectory() as folder:
+        for label, path in make_inputs(filename, fractions, folder).items():
+            size = os.path.getsize(path)
+            for case in cases:
+                state = case.setup(path)
+                timings, items = _time_case(case, state, warmup, repeat)
+                median = statistics.median(timings)
+                results.append({
+                    "case": case.name,
+                    "group": case.group,
+                    "input": label,
+                    "bytes": size,
+                    "items": items,
+                    "median_s": median,
+                    "min_s": min(timings),
+                    "stdev_s": statistics.stdev(timings) if len(timings) > 1 else 0.0,
+                    "items_per_s": items / median if median else 0.0,
+                    "mb_per_s": size / median / 1e6 if median else 0.0,
+                    "peak_bytes": _peak_memory(case, state),
+                })
+                print(f"  {case.name:<24} {label:>5}  {median * 1000:9.1f} ms"
+                      f"  {results[-1]['items_per_s']:>12,.0f} items/s"
+                      f"  {results[-1]['peak_bytes'] / 1024:>10,.1f} KB peak")
+    return {
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "file": filename,
+        "warmup": warmup,
+        "repeat": repeat,
+        "results": results,
+    }
+
+
+# ─────────────────────────────────────────────
+#  Baseline comparison
+# ─────────────────────────────────────────────
+def compare(current: dict, baseline: dict, threshold: float = THRESHOLD) -> list[str]:
+    """Describe every case whose median time or peak memory grew more than threshold."""
+    previous = {(row["case"], row["input"]): row for row in baseline["results"]}
+    regressions = []
+    for row in current["results"]:
+        old = previous.get((row["case"], row["input"]))
+        if old is None:
+            continue
+        for metric in ("median_s", "peak_bytes"):
+            if old[metric] and row[metric] > old[metric] * (1 + threshold):
+                change = row[metric] / old[metric] - 1
+                regressions.append(f"{row['case']} [{row['input']}] {metric}: "
+                                   f"{old[metric]:.6g} → {row[metric]:.6g} (+{change:.0%})")
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the Log Analysis Tool.")
+    parser.add_argument("file", nargs="?", default=FILE)
+    parser.add_argument("--sizes", type=float, nargs="+", default=list(SIZES),
+                        help="fractions of the log to benchmark, e.g. 0.1 0.5 1")
+    parser.add_argument("--warmup", type=int, default=1)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--group", choices=sorted({case.group for case in CASES}))
+    parser.add_argument("--output", help="write results as JSON here")
+    parser.add_argument("--baseline", help="compare against this saved JSON result")
+    parser.add_argument("--threshold", type=float, default=THRESHOLD)
+    args = parser.parse_args(argv)
+    if args.repeat < 1:
+        parser.error("--repeat must be at least 1")
+
+    print("=" * 50)
+    print(f"  BENCHMARKS  ({args.warmup} warmup, {args.repeat} repeats)")
+    print("=" * 50)
+    current = run_suite(args.file, args.sizes, args.warmup, args.repeat, only=args.group)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(current, file, indent=2)
+        print(f"\n  Results written to {args.output}")
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as file:
+            regressions = compare(current, json.load(file), args.threshold)
+        if regressions:
+            print(f"\n  REGRESSIONS (> {args.threshold:.0%}):")
+            for line in regressions:
+                print(f"    {line}")
+            return 1
+        print(f"\n  No regressions against {args.baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,288 @@
+import calendar
+import time
+from array import array
+from collections import Counter
+from dataclasses import dataclass
+from typing import Optional
+
+from init import DEFAULT_YEAR, NO_TIME, LogEntry, timer, memory_tracker, log_reader
+
+CAUGHT_UP = 1.25        # a burst whose rate is within 25% of the adapted EWMA is the new normal
+# epoch_ms decodes every date in DEFAULT_YEAR, so 01-01 after 12-31 lands almost a year back;
+# a backwards step of more than half a year is a new year, and later entries move on by one
+YEAR_SECONDS = (366 if calendar.isleap(DEFAULT_YEAR) else 365) * 86_400
+
+
+# ─────────────────────────────────────────────
+#  Events
+# ─────────────────────────────────────────────
+@dataclass
+class BurstEvent:
+    """A tag's error rate crossing into ("start") or out of ("end") a burst.
+
+    rate and baseline are errors per second: rate over the ring window,
+    baseline the tag's EWMA. total and peak cover the burst so far (peak is
+    the highest window count seen).
+    """
+    kind: str
+    tag: str
+    epoch_ms: int
+    rate: float
+    baseline: float
+    total: int
+    peak: int
+
+    def __str__(self) -> str:
+        return (f"[{self.kind.upper():<5}] {self.tag}: {self.rate:.1f}/s "
+                f"(baseline {self.baseline:.2f}/s, {self.total} errors, peak {self.peak})")
+
+
+class _TagWindow:
+    __slots__ = ("ring", "second", "total", "ewma", "base", "burst", "burst_total", "peak")
+
+    def __init__(self, window: int, second: int):
+        self.ring = array("I", bytes(4 * window))
+        self.second = second
+        self.total = 0
+        self.ewma = 0.0
+        self.base = 0.0                 # baseline frozen when the current burst started
+        self.burst = False
+        self.burst_total = 0
+        self.peak = 0
+
+
+# ─────────────────────────────────────────────
+#  Detector
+# ─────────────────────────────────────────────
+class BurstDetector:
+    """Streaming per-tag error-burst detector with constant work per entry.
+
+    Each tag keeps a ring of per-second error counts covering `window`
+    seconds and an exponentially weighted per-second rate (the baseline).
+    A burst starts when the window holds at least `min_count` errors and
+    its rate is `ratio` times the baseline (never below `min_rate`). It
+    ends once the window falls under half that threshold, measured against
+    the baseline from before the burst, or once the still-adapting EWMA
+    has caught up to within 25% of the rate (a new normal). Moving a tag
+    forward steps through at most `window` seconds, and the global clock
+    only revisits tags that are mid-burst, so per-entry cost is bounded.
+    Time comes from the entries themselves, so live and replayed logs
+    behave the same; late lines, and lines whose date does not exist
+    (NO_TIME), are counted in the current second. A log that runs past
+    New Year keeps a continuous clock: events after it carry epoch_ms in
+    the following year.
+    """
+
+    def __init__(self, window: int = 10, alpha: float = 0.05, ratio: float = 5.0,
+                 min_count: int = 20, min_rate: float = 0.2, levels=("E", "F")):
+        if not isinstance(window, int) or isinstance(window, bool):
+            raise TypeError("Window must be an integer number of seconds.")
+        if window < 1:
+            raise ValueError("Window must be at least 1 second.")
+        if not 0 < alpha <= 1:
+            raise ValueError("Alpha must be in (0, 1].")
+        if ratio <= 1:
+            raise ValueError("Ratio must be greater than 1.")
+        if min_count < 1:
+            raise ValueError("Minimum count must be at least 1.")
+        self.window = window
+        self.alpha = alpha
+        self.ratio = ratio
+        self.min_count = min_count
+        self.min_rate = min_rate
+        self.levels = frozenset(levels)
+        self.tags: dict[str, _TagWindow] = {}
+        self._bursting: dict[str, _TagWindow] = {}
+        self._clock = -1
+        self._shift = 0                 # seconds added for each New Year the log has crossed
+
+    def _threshold(self, baseline: float) -> float:
+        """Window count needed to start a burst."""
+        return max(self.min_count, self.ratio * max(baseline, self.min_rate) * self.window)
+
+    def _ended(self, state: _TagWindow) -> bool:
+        return (state.total * 2 < self._threshold(state.base)
+                or state.total < CAUGHT_UP * state.ewma * self.window)
+
+    def _event(self, kind: str, tag: str, state: _TagWindow, second: int) -> BurstEvent:
+        return BurstEvent(kind, tag, second * 1000, state.total / self.window,
+                          state.ewma, state.burst_total, state.peak)
+
+    def _advance(self, tag: str, state: _TagWindow, second: int, events: list) -> None:
+        """Move a tag's window forward to `second`, closing its burst if the rate has dropped."""
+        gap = second - state.second
+        if gap <= 0:
+            return
+        ring, window, keep = state.ring, self.window, 1 - self.alpha
+        first = state.second + 1
+        steps = min(gap, window)
+        for current in range(first, first + steps):
+            # fold the finished second into the baseline, then free its slot's oldest count
+            state.ewma = self.alpha * ring[(current - 1) % window] + keep * state.ewma
+            slot = current % window
+            state.total -= ring[slot]
+            ring[slot] = 0
+            if state.burst and self._ended(state):
+                state.burst = False
+                del self._bursting[tag]
+                events.append(self._event("end", tag, state, current))
+        if gap > steps:
+            state.ewma *= keep ** (gap - steps)     # the rest were empty seconds
+        state.second = second
+
+    def add(self, entry: LogEntry) -> list[BurstEvent]:
+        """Feed one entry; return the burst events it triggered (usually none)."""
+        events: list[BurstEvent] = []
+        ms = entry.epoch_ms
+        if ms == NO_TIME:
+            second = self._clock
+        else:
+            second = ms // 1000 + self._shift
+            if second < self._clock - YEAR_SECONDS // 2:
+                self._shift += YEAR_SECONDS
+                second += YEAR_SECONDS
+        if second > self._clock:
+            for tag, state in list(self._bursting.items()):
+                self._advance(tag, state, second, events)
+            self._clock = second
+        else:
+            second = self._clock
+        if entry.level not in self.levels:
+            return events
+
+        tag = entry.tag
+        state = self.tags.get(tag)
+        if state is None:
+            state = self.tags[tag] = _TagWindow(self.window, second)
+        else:
+            self._advance(tag, state, second, events)
+        state.ring[second % self.window] += 1
+        state.total += 1
+        if state.burst:
+            state.burst_total += 1
+            state.peak = max(state.peak, state.total)
+        elif state.total >= self._threshold(state.ewma):
+            state.burst = True
+            state.base = state.ewma
+            state.burst_total = state.peak = state.total
+            self._bursting[tag] = state
+            events.append(self._event("start", tag, state, second))
+        return events
+
+    def flush(self) -> list[BurstEvent]:
+        """Close every open burst at the end of the input."""
+        events: list[BurstEvent] = []
+        for tag, state in list(self._bursting.items()):
+            state.burst = False
+            events.append(self._event("end", tag, state, self._clock + 1))
+        self._bursting.clear()
+        return events
+
+    def __repr__(self) -> str:
+        return (f"BurstDetector(window={self.window}s, tags={len(self.tags)}, "
+                f"bursting={len(self._bursting)})")
+
+
+# ─────────────────────────────────────────────
+#  Streaming and replay
+# ─────────────────────────────────────────────
+def detect(entries, detector: Optional[BurstDetector] = None, **options):
+    """Yield burst events from any stream of entries, e.g. log_reader(..., follow=True)."""
+    detector = detector or BurstDetector(**options)
+    add = detector.add
+    for entry in entries:
+        events = add(entry)
+        if events:
+            yield from events
+    yield from detector.flush()
+
+
+def replay(filename: str, speed: Optional[float] = None,
+           detector: Optional[BurstDetector] = None, **options):
+    """Run the detector over an offline log.
+
+    Only lines at the detector's lowest level or above are parsed (see
+    line_filter); the detector's clock comes from those lines. With
+    speed=None the file is replayed as fast as it can be read; speed=1.0
+    paces it in real time, speed=60 a minute of log per second.
+    """
+    detector = detector or BurstDetector(**options)
+    ranks = [LogEntry.LEVELS[level] for level in detector.levels if level in LogEntry.LEVELS]
+    floor = min(ranks, default=0)
+    min_level = next(level for level, rank in LogEntry.LEVELS.items() if rank == floor)
+    entries = log_reader(filename, min_level=min_level)
+    if speed is not None:
+        if speed <= 0:
+            raise ValueError("Speed must be positive.")
+        entries = _paced(entries, speed)
+    yield from detect(entries, detector)
+
+
+def _paced(entries, speed: float):
+    start_wall = start_log = None
+    shift = latest = 0
+    for entry in entries:
+        if entry.epoch_ms == NO_TIME:
+            yield entry                 # no timestamp to pace by
+            continue
+        ms = entry.epoch_ms + shift
+        if start_log is None:
+            start_wall, start_log = time.monotonic(), ms
+        elif ms < latest - YEAR_SECONDS * 500:             # half a year back: New Year
+            shift += YEAR_SECONDS * 1000
+            ms += YEAR_SECONDS * 1000
+        latest = max(latest, ms)
+        delay = (ms - start_log) / 1000 / speed - (time.monotonic() - start_wall)
+        if delay > 0.01:
+            time.sleep(delay)
+        yield entry
+
+
+# ─────────────────────────────────────────────
+#  Comparison functions
+# ─────────────────────────────────────────────
+@timer
+@memory_tracker
+def approach_bucket_all(filename: str, window: int = 10) -> int:
+    """Counts every (tag, second) in memory first, then scans each tag's seconds for spikes."""
+    seconds: Counter = Counter()
+    for entry in log_reader(filename, min_level="E"):
+        seconds[(entry.tag, entry.epoch_ms // 1000)] += 1
+    by_tag: dict[str, list[int]] = {}
+    for tag, second in sorted(seconds):
+        by_tag.setdefault(tag, []).append(second)
+    spikes = 0
+    for tag, keys in by_tag.items():
+        for start in keys:
+            if sum(seconds[(tag, second)] for second in range(start, start + window)) >= 20:
+                spikes += 1
+    return spikes
+
+
+@timer
+@memory_tracker
+def approach_streaming(filename: str) -> int:
+    """Constant-memory replay through BurstDetector."""
+    return sum(1 for event in replay(filename) if event.kind == "start")
+
+
+# ─────────────────────────────────────────────
+#  Run comparison
+# ─────────────────────────────────────────────
+FILE = "./datasets/Android.log"
+
+if __name__ == "__main__":
+    print("=" * 50)
+    print("  BUCKET ALL  (every tag-second in RAM)")
+    print("=" * 50)
+    count = approach_bucket_all(FILE)
+    print(f"  Busy windows      : {count}\n")
+
+    print("=" * 50)
+    print("  STREAMING  (EWMA + per-second ring)")
+    print("=" * 50)
+    count = approach_streaming(FILE)
+    print(f"  Bursts detected   : {count}\n")
+
+    for event in replay(FILE):
+        print(f"  {event}")
@@ -0,0 +1,278 @@
+import json
+import mmap
+import os
+import struct
+import sys
+from typing import Optional
+
+from init import LogEntry, timer, memory_tracker, approach_generator
+from batch import LogBatch
+from time_index import head_digest
+
+SUFFIX = ".cache"
+MAGIC = b"LOGCACH2"
+ALIGN = 8
+
+# magic, byte order, source size, source mtime (ns), head digest, length of the JSON directory
+_HEADER = struct.Struct("<8s8sQq20sQ")
+
+
+def _padding(position: int) -> int:
+    return -position % ALIGN
+
+
+# ─────────────────────────────────────────────
+#  Writing
+# ─────────────────────────────────────────────
+def write_cache(filename: str, batch: LogBatch, path: Optional[str] = None,
+                stat: Optional[os.stat_result] = None) -> str:
+    """Write a parsed batch as a columnar binary file next to its source log.
+
+    The file is a header, a JSON directory (section offsets, typecodes, tag
+    and date tables, level letters, the year behind epoch_ms) and then every column back to back,
+    each aligned so it can be cast straight out of a memory map.
+    `stat` is the source's os.stat from before the batch was read; the
+    cache is stamped with it, so a log that changed during the read looks
+    stale next time instead of fresh. It defaults to the file as it is now.
+    """
+    path = path or filename + SUFFIX
+    stat = stat or os.stat(filename)
+    columns = batch.columns()
+    sections = {}
+    position = 0
+    for name, column in columns.items():
+        length = len(column) * column.itemsize if hasattr(column, "itemsize") else len(column)
+        typecode = getattr(column, "typecode", "B")
+        sections[name] = [position, length, typecode]
+        position += length + _padding(length)
+    directory = json.dumps({
+        "rows": len(batch),
+        "year": batch.year,
+        "tags": batch.tags,
+        "dates": batch.dates,
+        "levels": batch.level_names,
+        "sections": sections,
+    }, separators=(",", ":")).encode("utf-8")
+    directory += b" " * _padding(_HEADER.size + len(directory))
+
+    temporary = path + ".tmp"
+    with open(temporary, "wb") as file:
+        file.write(_HEADER.pack(MAGIC, sys.byteorder.encode("ascii").ljust(8, b"\0"),
+                                stat.st_size, stat.st_mtime_ns,
+                                head_digest(filename, stat.st_size), len(directory)))
+        file.write(directory)
+        for column in columns.values():
+            data = column.tobytes() if hasattr(column, "tobytes") else bytes(column)
+            file.write(data)
+            file.write(b"\0" * _padding(len(data)))
+    os.replace(temporary, path)
+    return path
+
+
+# ─────────────────────────────────────────────
+#  CachedLog
+# ─────────────────────────────────────────────
+class CachedLog:
+    """Read-only, memory-mapped view of a cache file with the same accessors as LogBatch.
+
+    Numeric columns are memoryviews cast over the map, so opening the
+    cache costs a header read no matter how many entries it holds.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._views: list[memoryview] = []
+        self._map = None
+        self._file = open(path, "rb")
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            self._load()
+        except ValueError:
+            self.close()
+            raise
+
+    def _load(self) -> None:
+        header = self._map[:_HEADER.size]
+        if len(header) != _HEADER.size:
+            raise ValueError(f"Truncated cache file: {self.path}")
+        magic, order, self.size, self.mtime_ns, self.digest, length = _HEADER.unpack(header)
+        if magic != MAGIC or order.rstrip(b"\0").decode("ascii") != sys.byteorder:
+            raise ValueError(f"Not a cache file for this machine: {self.path}")
+        directory = json.loads(self._map[_HEADER.size:_HEADER.size + length])
+        base = _HEADER.size + length
+        view = memoryview(self._map)
+        self._views.append(view)
+        self._starts = {}
+        for name, (offset, size, typecode) in directory["sections"].items():
+            self._starts[name] = base + offset
+            column = view[base + offset:base + offset + size]
+            if typecode != "B":
+                column = column.cast(typecode)
+            self._views.append(column)
+            setattr(self, name, column)
+        self.rows = directory["rows"]
+        self.year = directory["year"]
+        self.tags = directory["tags"]
+        self.dates = directory["dates"]
+        self.level_names = directory["levels"]
+
+    def close(self) -> None:
+        for view in reversed(self._views):
+            view.release()              # the map refuses to close while views are exported
+        self._views = []
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        self._file.close()
+
+    ####################### Column access #######################
+
+    def level(self, index: int) -> str:
+        return self.level_names[self.levels[index]]
+
+    def tag(self, index: int) -> str:
+        return self.tags[self.tag_ids[index]]
+
+    def date(self, index: int) -> str:
+        return self.dates[self.date_ids[index]]
+
+    def time(self, index: int) -> str:
+        start = self.time_ends[index - 1] if index else 0
+        return bytes(self.times[start:self.time_ends[index]]).decode("ascii")
+
+    def message(self, index: int) -> str:
+        start = self.message_ends[index - 1] if index else 0
+        return bytes(self.messages[start:self.message_ends[index]]).decode("utf-8")
+
+    ####################### Magic Methods #######################
+
+    def __len__(self) -> int:
+        return self.rows
+
+    def __getitem__(self, index: int) -> LogEntry:
+        if not isinstance(index, int) or isinstance(index, bool):
+            raise TypeError("Index must be an integer.")
+        if index < 0:
+            index += self.rows
+        if not 0 <= index < self.rows:
+            raise IndexError("CachedLog index out of range.")
+        return LogEntry(
+            date=self.date(index), time=self.time(index),
+            pid=self.pids[index], tid=self.tids[index],
+            level=self.level(index),
+            tag=self.tag(index),
+            message=self.message(index),
+        )
+
+    def __iter__(self):
+        buffer = self._map
+        tags, dates, levels = self.tags, self.dates, self.level_names
+        time_start = times = self._starts["times"]
+        message_start = messages = self._starts["messages"]
+        for pid, tid, level, tag_id, date_id, time_end, message_end in zip(
+                self.pids, self.tids, self.levels, self.tag_ids, self.date_ids,
+                self.time_ends, self.message_ends):
+            time_end += times
+            message_end += messages
+            yield LogEntry(
+                date=dates[date_id], time=buffer[time_start:time_end].decode("ascii"),
+                pid=pid, tid=tid,
+                level=levels[level],
+                tag=tags[tag_id],
+                message=buffer[message_start:message_end].decode("utf-8"),
+            )
+            time_start, message_start = time_end, message_end
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __repr__(self) -> str:
+        return f"CachedLog(path={self.path!r}, entries={self.rows}, tags={len(self.tags)})"
+
+
+# ─────────────────────────────────────────────
+#  Opening
+# ─────────────────────────────────────────────
+def is_current(filename: str, cached: CachedLog) -> bool:
+    stat = os.stat(filename)
+    return (cached.size == stat.st_size and cached.mtime_ns == stat.st_mtime_ns
+            and cached.digest == head_digest(filename, stat.st_size))
+
+
+def open_cached(filename: str) -> CachedLog:
+    """Memory-map the parsed cache for a log, (re)building it first if missing or stale."""
+    if not isinstance(filename, str):
+        raise TypeError("File name must be str.")
+    if not filename.strip():
+        raise ValueError("File name must not be empty.")
+    path = filename + SUFFIX
+    if os.path.exists(path):
+        try:
+            cached = CachedLog(path)
+        except ValueError:
+            cached = None
+        if cached is not None:
+            if is_current(filename, cached):
+                return cached
+            cached.close()
+    stat = os.stat(filename)            # before reading, in case the log grows meanwhile
+    write_cache(filename, LogBatch.from_file(filename), path, stat)
+    return CachedLog(path)
+
+
+def cached_reader(filename: str):
+    """Yield LogEntry objects from the binary cache — regex work happens only on the first run."""
+    with open_cached(filename) as cached:
+        yield from cached
+
+
+# ─────────────────────────────────────────────
+#  Comparison functions
+# ─────────────────────────────────────────────
+@timer
+@memory_tracker
+def approach_cached(filename: str) -> int:
+    """Iterates LogEntry objects rebuilt from the memory-mapped cache."""
+    count = 0
+    for entry in cached_reader(filename):
+        count += 1
+    return count
+
+
+@timer
+@memory_tracker
+def approach_cached_columns(filename: str) -> int:
+    """Counts errors straight from the level column — no objects at all."""
+    with open_cached(filename) as cached:
+        error = cached.level_names.index("E") if "E" in cached.level_names else -1
+        return cached.levels.tobytes().count(bytes([error])) if error >= 0 else 0
+
+
+# ─────────────────────────────────────────────
+#  Run comparison
+# ─────────────────────────────────────────────
+FILE = "./datasets/Android.log"
+
+if __name__ == "__main__":
+    print("=" * 50)
+    print("  GENERATOR  (regex on every line)")
+    print("=" * 50)
+    count = approach_generator(FILE)
+    print(f"  Entries processed : {count}\n")
+
+    open_cached(FILE).close()           # first run pays for the parse once
+
+    print("=" * 50)
+    print("  CACHE  (memory-mapped columns → LogEntry)")
+    print("=" * 50)
+    count = approach_cached(FILE)
+    print(f"  Entries processed : {count}\n")
+
+    print("=" * 50)
+    print("  CACHE  (level column only)")
+    print("=" * 50)
+    count = approach_cached_columns(FILE)
+    print(f"  Error entries     : {count}\n")
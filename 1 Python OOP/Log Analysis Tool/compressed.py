@@ -0,0 +1,257 @@
+import bz2
+import gzip
+import io
+import lzma
+import mmap
+import os
+import shutil
+import tempfile
+import zlib
+from bisect import bisect_right
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+from init import timer, log_reader
+
+BUFFER_SIZE = 1024 * 1024
+GZIP_MEMBER_BYTES = 4 * 1024 * 1024
+
+MAGIC = {
+    "gzip": b"\x1f\x8b",
+    "bz2": b"BZh",
+    "xz": b"\xfd7zXZ\x00",
+}
+
+
+def detect_codec(filename: str) -> Optional[str]:
+    """Name of the compression the file starts with, or None for plain text."""
+    with open(filename, "rb") as file:
+        head = file.read(6)
+    for codec, magic in MAGIC.items():
+        if head.startswith(magic):
+            return codec
+    return None
+
+
+# ─────────────────────────────────────────────
+#  Parallel multi-member gzip
+# ─────────────────────────────────────────────
+def _is_header(buffer, position: int) -> bool:
+    """Whether a gzip member header can start at `position`: magic, deflate, and sane FLG/XFL/OS bytes."""
+    header = buffer[position:position + 10]
+    return (len(header) == 10 and header[:3] == b"\x1f\x8b\x08" and not header[3] & 0xE0
+            and header[8] in (0, 2, 4) and (header[9] <= 13 or header[9] == 255))
+
+
+def _next_start(buffer, position: int) -> int:
+    """Offset of the first plausible member header after `position`, or -1."""
+    position = buffer.find(b"\x1f\x8b\x08", position + 1)
+    while position != -1 and not _is_header(buffer, position):
+        position = buffer.find(b"\x1f\x8b\x08", position + 1)
+    return position
+
+
+def _member_starts(buffer) -> list[int]:
+    """Offsets that look like gzip member headers.
+
+    Compressed data can contain the same bytes by chance, so these are
+    only candidates; _inflate tells real members from false starts.
+    """
+    starts = [0] if _is_header(buffer, 0) else []
+    position = _next_start(buffer, 0)
+    while position != -1:
+        starts.append(position)
+        position = _next_start(buffer, position)
+    return starts
+
+
+def _skip_padding(buffer, position: int) -> int:
+    # gzip allows zero bytes after a member (tape blocks, preallocated files)
+    while position < len(buffer) and buffer[position] == 0:
+        position += 1
+    return position
+
+
+def _inflate(buffer, start: int, end: int) -> Optional[bytes]:
+    """Inflate exactly one member spanning [start, end), or None if it does not fit that span."""
+    inflater = zlib.decompressobj(wbits=31)
+    try:
+        data = inflater.decompress(buffer[start:end])
+    except zlib.error:
+        return None
+    if not inflater.eof or inflater.unused_data.strip(b"\0"):
+        return None
+    return data
+
+
+def _inflate_from(buffer, start: int):
+    """Inflate one member serially from a real header, at most BUFFER_SIZE bytes at a time.
+
+    Yields the data and returns where the member ended. A member cut
+    short raises EOFError, as gzip does.
+    """
+    inflater = zlib.decompressobj(wbits=31)
+    position = start
+    while not inflater.eof:
+        block = inflater.unconsumed_tail
+        if not block and position < len(buffer):
+            block = buffer[position:position + BUFFER_SIZE]
+            position += len(block)
+        data = inflater.decompress(block, BUFFER_SIZE)
+        if data:
+            yield data
+        elif not block:
+            raise EOFError("Compressed file ended before the end-of-stream marker was reached")
+    return position - len(inflater.unused_data)
+
+
+def _is_multi_member(buffer) -> bool:
+    """Whether the file really holds more than one member.
+
+    Only a header-looking candidate makes this inflate anything: the first
+    member is then walked to its real trailer (its data thrown away) and
+    must be followed, after any padding, by another member header.
+    """
+    if not _is_header(buffer, 0) or _next_start(buffer, 0) == -1:
+        return False
+    members = _inflate_from(buffer, 0)
+    while True:
+        try:
+            next(members)
+        except StopIteration as stop:
+            end = _skip_padding(buffer, stop.value)
+            return _is_header(buffer, end)
+
+
+def gzip_members(filename: str, workers: Optional[int] = None):
+    """Yield the decompressed bytes of each gzip member in order, inflating them on threads.
+
+    zlib releases the GIL while it works, so members decompress in parallel,
+    two per worker at a time. When a candidate boundary turns out to be
+    false, the member is inflated serially from the last real boundary and
+    yielded BUFFER_SIZE bytes at a time. Zero padding after a member ends
+    the stream like it does for gzip.
+    """
+    workers = workers or os.cpu_count() or 1
+    window = workers * 2
+    with open(filename, "rb") as file, \
+            mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as buffer, \
+            ThreadPoolExecutor(max_workers=workers) as pool:
+        starts = _member_starts(buffer) + [len(buffer)]
+        position = 0                        # always a real member boundary
+        while position < len(buffer):
+            ends = starts[bisect_right(starts, position):][:window]
+            spans = list(zip([position] + ends, ends))
+            for (start, end), data in zip(spans, pool.map(lambda span: _inflate(buffer, *span), spans)):
+                if data is None:
+                    end = yield from _inflate_from(buffer, start)
+                    position = _skip_padding(buffer, end)
+                    break
+                yield data
+                position = end
+
+
+class _ChunkReader(io.RawIOBase):
+    """Raw stream over an iterator of byte chunks, so TextIOWrapper can decode it.
+
+    Closing the stream closes the iterator too, so a generator such as
+    gzip_members releases its mmap and thread pool at once rather than
+    whenever it is garbage-collected.
+    """
+
+    def __init__(self, chunks):
+        self._chunks = iter(chunks)
+        self._pending = b""
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, target) -> int:
+        while not self._pending:
+            self._pending = next(self._chunks, b"")
+            if not self._pending:
+                return 0
+        size = min(len(target), len(self._pending))
+        target[:size] = self._pending[:size]
+        self._pending = self._pending[size:]
+        return size
+
+    def close(self) -> None:
+        if not self.closed:
+            self._pending = b""
+            close = getattr(self._chunks, "close", None)
+            if close is not None:
+                close()
+        super().close()
+
+
+# ─────────────────────────────────────────────
+#  Opening
+# ─────────────────────────────────────────────
+def open_log(filename: str, workers: Optional[int] = None):
+    """Open a log as text, decompressing gzip/bz2/xz transparently by their magic bytes."""
+    codec = detect_codec(filename)
+    if codec is None:
+        return open(filename, "r", encoding="utf-8", errors="replace",
+                    buffering=BUFFER_SIZE)
+    if codec == "gzip":
+        with open(filename, "rb") as file, \
+                mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            multi_member = _is_multi_member(buffer)
+        if multi_member and (workers or os.cpu_count() or 1) > 1:
+            binary = io.BufferedReader(_ChunkReader(gzip_members(filename, workers)),
+                                       buffer_size=BUFFER_SIZE)
+        else:
+            binary = io.BufferedReader(gzip.open(filename, "rb"), buffer_size=BUFFER_SIZE)
+    elif codec == "bz2":
+        binary = io.BufferedReader(bz2.open(filename, "rb"), buffer_size=BUFFER_SIZE)
+    else:
+        binary = io.BufferedReader(lzma.open(filename, "rb"), buffer_size=BUFFER_SIZE)
+    return io.TextIOWrapper(binary, encoding="utf-8", errors="replace")
+
+
+def write_gzip_members(source: str, target: str, member_bytes: int = GZIP_MEMBER_BYTES) -> None:
+    """Compress a log as many independent gzip members (pigz/bgzip-style) so it can be read in parallel."""
+    with open(source, "rb") as src, open(target, "wb") as dst:
+        while True:
+            block = src.read(member_bytes)
+            if not block:
+                break
+            dst.write(gzip.compress(block, compresslevel=6))
+
+
+# ─────────────────────────────────────────────
+#  Comparison functions
+# ─────────────────────────────────────────────
+@timer
+def approach_codec(filename: str) -> int:
+    """Streams entries through log_reader, whatever the file's compression.
+
+    Timed only — tracemalloc would swamp the decompressors' own cost.
+    """
+    return sum(1 for _ in log_reader(filename))
+
+
+# ─────────────────────────────────────────────
+#  Run comparison
+# ─────────────────────────────────────────────
+FILE = "./datasets/Android.log"
+
+if __name__ == "__main__":
+    size = os.path.getsize(FILE)
+    with tempfile.TemporaryDirectory() as folder:
+        copies = {"plain": FILE}
+        for codec, opener in (("gzip", gzip.open), ("bz2", bz2.open), ("xz", lzma.open)):
+            copies[codec] = os.path.join(folder, f"Android.log.{codec}")
+            with open(FILE, "rb") as src, opener(copies[codec], "wb") as dst:
+                shutil.copyfileobj(src, dst, BUFFER_SIZE)
+        copies["gzip (members)"] = os.path.join(folder, "Android.log.members.gz")
+        write_gzip_members(FILE, copies["gzip (members)"])
+
+        for name, path in copies.items():
+            print("=" * 50)
+            print(f"  {name.upper()}  ({os.path.getsize(path) / 1024 / 1024:.1f} MB on disk)")
+            print("=" * 50)
+            count = approach_codec(path)
+            print(f"  Entries processed : {count}\n")
+    print(f"  Uncompressed size : {size / 1024 / 1024:.1f} MB")
@@ -0,0 +1,180 @@
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional
+
+from init import LogEntry, timer, memory_tracker, log_reader
+
+
+# ─────────────────────────────────────────────
+#  Collapsed entries
+# ─────────────────────────────────────────────
+@dataclass
+class Collapsed:
+    """One entry standing for `count` duplicates of its (tag, level, message), first to last."""
+    entry: LogEntry
+    count: int
+    first: str
+    last: str
+
+    def __str__(self) -> str:
+        repeats = f" ×{self.count} ({self.first} → {self.last})" if self.count > 1 else ""
+        return f"{self.first} {self.entry.level} {self.entry.tag}: {self.entry.message}{repeats}"
+
+
+# ─────────────────────────────────────────────
+#  Deduplicator
+# ─────────────────────────────────────────────
+class Deduplicator:
+    """Streaming collapse of repeated (tag, level, message) entries in bounded memory.
+
+    With window=None only consecutive duplicates collapse: one group is
+    open at a time, so memory is constant. With window=n, an entry joins
+    any group whose first entry is at most n entries back, which catches
+    a polling loop interleaved with other threads. Groups close in the
+    order they opened, so output stays in log order of first occurrence,
+    and at most n + 1 groups are ever open. The pid and tid of the first
+    entry are kept; later duplicates only move `last` and `count`.
+    """
+
+    def __init__(self, window: Optional[int] = None):
+        if window is not None:
+            if not isinstance(window, int) or isinstance(window, bool):
+                raise TypeError("Window must be an integer number of entries.")
+            if window < 1:
+                raise ValueError("Window must be at least 1 entry.")
+        self.window = window
+        self.entries_in = 0
+        self.entries_out = 0
+        self.largest = 0
+        self._open: OrderedDict = OrderedDict()      # key → [Collapsed, index of first entry]
+        self._current: Optional[Collapsed] = None
+        self._key = None
+
+    def add(self, entry: LogEntry) -> list[Collapsed]:
+        """Feed one entry; return the groups it closed (usually none)."""
+        self.entries_in += 1
+        key = (entry.tag, entry.level, entry.message)
+        stamp = f"{entry.date} {entry.time}"
+        if self.window is None:
+            current = self._current
+            if current is not None and key == self._key:
+                current.count += 1
+                current.last = stamp
+                return []
+            self._current, self._key = Collapsed(entry, 1, stamp, stamp), key
+            return [self._close(current)] if current is not None else []
+
+        closed = []
+        groups = self._open
+        horizon = self.entries_in - self.window - 1
+        while groups:
+            oldest = next(iter(groups.values()))
+            if oldest[1] > horizon:
+                break
+            closed.append(self._close(groups.popitem(last=False)[1][0]))
+        group = groups.get(key)
+        if group is None:
+            groups[key] = [Collapsed(entry, 1, stamp, stamp), self.entries_in]
+        else:
+            group[0].count += 1
+            group[0].last = stamp
+        return closed
+
+    def _close(self, group: Collapsed) -> Collapsed:
+        self.entries_out += 1
+        if group.count > self.largest:
+            self.largest = group.count
+        return group
+
+    def flush(self) -> list[Collapsed]:
+        """Close every open group at the end of the input."""
+        if self.window is None:
+            current, self._current, self._key = self._current, None, None
+            return [self._close(current)] if current is not None else []
+        closed = [self._close(group) for group, _ in self._open.values()]
+        self._open.clear()
+        return closed
+
+    ####################### Report #######################
+
+    @property
+    def reduction(self) -> float:
+        """Share of input entries that were folded into an earlier one."""
+        return 1 - self.entries_out / self.entries_in if self.entries_in else 0.0
+
+    def report(self) -> str:
+        return "\n".join([
+            f"  Entries in        : {self.entries_in:,}",
+            f"  Entries out       : {self.entries_out:,}",
+            f"  Reduction         : {self.reduction:.1%}",
+            f"  Longest group     : {self.largest:,}",
+        ])
+
+    def __repr__(self) -> str:
+        return (f"Deduplicator(window={self.window}, in={self.entries_in}, "
+                f"out={self.entries_out}, open={len(self._open) + (self._current is not None)})")
+
+
+def dedup(entries, deduplicator: Optional[Deduplicator] = None, **options):
+    """Yield Collapsed groups from any stream of entries; read the report off the deduplicator.
+
+    Options such as window build a fresh Deduplicator; they cannot be
+    combined with one passed in, which already has its own.
+    """
+    if deduplicator is None:
+        deduplicator = Deduplicator(**options)
+    elif options:
+        raise TypeError("Pass either a deduplicator or its options, not both.")
+    add = deduplicator.add
+    for entry in entries:
+        closed = add(entry)
+        if closed:
+            yield from closed
+    yield from deduplicator.flush()
+
+
+# ─────────────────────────────────────────────
+#  Comparison functions
+# ─────────────────────────────────────────────
+@timer
+@memory_tracker
+def approach_dict_all(filename: str) -> int:
+    """One dict entry per distinct (tag, level, message) — grows with the log's variety."""
+    groups: dict = {}
+    for entry in log_reader(filename):
+        key = (entry.tag, entry.level, entry.message)
+        groups[key] = groups.get(key, 0) + 1
+    return len(groups)
+
+
+@timer
+@memory_tracker
+def approach_dedup(filename: str, window: Optional[int]) -> Deduplicator:
+    """Streaming collapse with at most `window` groups open."""
+    deduplicator = Deduplicator(window)
+    for _ in dedup(log_reader(filename), deduplicator):
+        pass
+    return deduplicator
+
+
+# ─────────────────────────────────────────────
+#  Run comparison
+# ─────────────────────────────────────────────
+FILE = "./datasets/Android.log"
+
+if __name__ == "__main__":
+    print("=" * 50)
+    print("  DICT OF ALL MESSAGES  (unbounded)")
+    print("=" * 50)
+    count = approach_dict_all(FILE)
+    print(f"  Distinct messages : {count}\n")
+
+    print("=" * 50)
+    print("  CONSECUTIVE  (one open group)")
+    print("=" * 50)
+    print(approach_dedup(FILE, None).report() + "\n")
+
+    print("=" * 50)
+    print("  WINDOWED  (last 1000 entries)")
+    print("=" * 50)
+    print(approach_dedup(FILE, 1000).report() + "\n")
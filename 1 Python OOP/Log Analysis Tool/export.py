@@ -0,0 +1,298 @@
+import csv
+import json
+import os
+import shutil
+import time
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from itertools import islice
+from operator import attrgetter
+from typing import Optional
+
+from init import LogEntry, timer, memory_tracker, log_reader, line_filter, _parse_lines
+from parallel import _plan, range_lines
+
+FORMATS = ("csv", "jsonl")
+COLUMNS = ("date", "time", "pid", "tid", "level", "tag", "message")
+SHARD_KEYS = ("tag", "pid")
+WRITE_BUFFER = 4 * 1024 * 1024
+BATCH = 8192                    # entries serialised and written per call
+
+_row = attrgetter(*COLUMNS)
+_quote = json.JSONEncoder(ensure_ascii=False).encode
+
+
+# ─────────────────────────────────────────────
+#  Serialisation
+# ─────────────────────────────────────────────
+def _jsonl(batch: list[LogEntry]) -> str:
+    # date, time and level are digits, punctuation and A–Z by construction; only tag and message need escaping
+    return "".join(
+        f'{{"date":"{entry.date}","time":"{entry.time}","pid":{entry.pid},"tid":{entry.tid},'
+        f'"level":"{entry.level}","tag":{_quote(entry.tag)},"message":{_quote(entry.message)}}}\n'
+        for entry in batch
+    )
+
+
+class _Sink:
+    """One output file: a large text buffer and, for CSV, a writer on top of it."""
+
+    def __init__(self, path: str, fmt: str, header: bool):
+        self.path = path
+        self.file = open(path, "w", encoding="utf-8", newline="", buffering=WRITE_BUFFER)
+        self.rows = 0
+        if fmt == "csv":
+            self._writer = csv.writer(self.file, lineterminator="\n")
+            if header:
+                self._writer.writerow(COLUMNS)
+            self.write = self._write_csv
+        else:
+            self.write = self._write_jsonl
+
+    def _write_csv(self, batch: list[LogEntry]) -> None:
+        self._writer.writerows(map(_row, batch))
+        self.rows += len(batch)
+
+    def _write_jsonl(self, batch: list[LogEntry]) -> None:
+        self.file.write(_jsonl(batch))
+        self.rows += len(batch)
+
+    def close(self) -> None:
+        self.file.close()
+
+
+def shard_of(value, shards: int) -> int:
+    """Shard number for a tag or pid — CRC-32 of its text, the same in every process and run."""
+    return zlib.crc32(str(value).encode("utf-8")) % shards
+
+
+def shard_paths(output: str, shards: int) -> list[str]:
+    """"out.csv" for one shard, otherwise "out-00000-of-00004.csv" and so on."""
+    if shards == 1:
+        return [output]
+    stem, extension = os.path.splitext(output)
+    return [f"{stem}-{number:05d}-of-{shards:05d}{extension}" for number in range(shards)]
+
+
+def _check(fmt: str, shard_by: Optional[str], shards: int) -> None:
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown format: {fmt!r}")
+    if not isinstance(shards, int) or isinstance(shards, bool):
+        raise TypeError("Shards must be an integer.")
+    if shards < 1:
+        raise ValueError("Shards must be at least 1.")
+    if shards > 1 and shard_by not in SHARD_KEYS:
+        raise ValueError(f"Sharding needs shard_by in {SHARD_KEYS}.")
+
+
+def _write_entries(entries, paths: list[str], fmt: str, shard_by: Optional[str],
+                   header: bool = True) -> list[int]:
+    """Write a stream of entries to the given shard files; return rows per shard."""
+    sinks = [_Sink(path, fmt, header) for path in paths]
+    try:
+        iterator = iter(entries)
+        if len(sinks) == 1:
+            write = sinks[0].write
+            while batch := list(islice(iterator, BATCH)):
+                write(batch)
+        else:
+            shards = len(sinks)
+            key = attrgetter(shard_by)
+            while batch := list(islice(iterator, BATCH)):
+                buckets: list[list[LogEntry]] = [[] for _ in sinks]
+                for entry in batch:
+                    buckets[shard_of(key(entry), shards)].append(entry)
+                for sink, bucket in zip(sinks, buckets):
+                    if bucket:
+                        sink.write(bucket)
+    finally:
+        for sink in sinks:
+            sink.close()
+    return [sink.rows for sink in sinks]
+
+
+# ─────────────────────────────────────────────
+#  Export
+# ─────────────────────────────────────────────
+@dataclass
+class ExportResult:
+    """Where the rows went and how fast, next to the bytes of log read."""
+    paths: list
+    rows: list
+    bytes_in: int
+    seconds: float
+    bytes_out: int = field(init=False)
+
+    def __post_init__(self):
+        self.bytes_out = sum(os.path.getsize(path) for path in self.paths)
+
+    @property
+    def throughput(self) -> float:
+        """Input megabytes per second."""
+        return self.bytes_in / 1e6 / self.seconds if self.seconds else 0.0
+
+    def __repr__(self) -> str:
+        return (f"ExportResult(files={len(self.paths)}, rows={sum(self.rows)}, "
+                f"throughput={self.throughput:.1f} MB/s)")
+
+
+def export(filename: str, output: str, fmt: str = "csv", shard_by: Optional[str] = None,
+           shards: int = 1, **filters) -> ExportResult:
+    """Stream log_reader's entries to CSV or JSON Lines, optionally split into shards.
+
+    Entries are serialised BATCH at a time and written through a
+    WRITE_BUFFER-byte buffer. With shards > 1, each entry goes to the file
+    picked by shard_of(tag or pid), so one tag or pid always lands in the
+    same file and keeps its log order there. Filters are log_reader's.
+    """
+    _check(fmt, shard_by, shards)
+    started = time.perf_counter()
+    paths = shard_paths(output, shards)
+    rows = _write_entries(log_reader(filename, **filters), paths, fmt, shard_by)
+    return ExportResult(paths, rows, os.path.getsize(filename), time.perf_counter() - started)
+
+
+def _export_range(filename: str, start: int, end: int, paths: list[str], fmt: str,
+                  shard_by: Optional[str], filters: dict) -> list[int]:
+    lines = range_lines(filename, start, end)
+    return _write_entries(_parse_lines(lines, line_filter(**filters)), paths, fmt, shard_by,
+                          header=False)
+
+
+def parallel_export(filename: str, output: str, fmt: str = "csv", shard_by: Optional[str] = None,
+                    shards: int = 1, workers: Optional[int] = None, **filters) -> ExportResult:
+    """export() with the parsing and serialising spread over a process pool.
+
+    Each newline-aligned chunk is written by its worker to part files next
+    to the output; workers stream their byte range line by line, so none
+    holds its chunk in memory. The parts are then concatenated in chunk
+    order, so every shard holds exactly what export() would have written.
+    Compressed logs cannot be split and go through export() instead.
+    """
+    _check(fmt, shard_by, shards)
+    started = time.perf_counter()
+    workers, ranges = _plan(filename, workers)
+    if ranges is None:
+        return export(filename, output, fmt, shard_by, shards, **filters)
+    paths = shard_paths(output, shards)
+    parts = [[f"{path}.part{number:05d}" for path in paths] for number in range(len(ranges))]
+    rows = [0] * shards
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(_export_range, filename, start, end, chunk_parts, fmt,
+                                   shard_by, filters)
+                       for (start, end), chunk_parts in zip(ranges, parts)]
+            for future in futures:
+                rows = [total + count for total, count in zip(rows, future.result())]
+        for shard, path in enumerate(paths):
+            with open(path, "wb") as target:
+                if fmt == "csv":
+                    target.write((",".join(COLUMNS) + "\n").encode("utf-8"))
+                for chunk_parts in parts:
+                    with open(chunk_parts[shard], "rb") as source:
+                        shutil.copyfileobj(source, target, WRITE_BUFFER)
+    finally:
+        for path in (path for chunk_parts in parts for path in chunk_parts):
+            if os.path.exists(path):
+                os.remove(path)
+    return ExportResult(paths, rows, os.path.getsize(filename), time.perf_counter() - started)
+
+
+# ─────────────────────────────────────────────
+#  Comparison functions
+# ─────────────────────────────────────────────
+@timer
+@memory_tracker
+def approach_raw_read(filename: str) -> float:
+    """Reads the file in WRITE_BUFFER blocks and nothing else — the ceiling for any exporter."""
+    started = time.perf_counter()
+    with open(filename, "rb") as file:
+        while file.read(WRITE_BUFFER):
+            pass
+    return os.path.getsize(filename) / 1e6 / (time.perf_counter() - started)
+
+
+@timer
+@memory_tracker
+def approach_parse_only(filename: str) -> float:
+    """log_reader with nothing written — what export() could reach if serialising were free."""
+    started = time.perf_counter()
+    for _ in log_reader(filename):
+        pass
+    return os.path.getsize(filename) / 1e6 / (time.perf_counter() - started)
+
+
+@timer
+@memory_tracker
+def approach_row_by_row(filename: str, output: str) -> int:
+    """One json.dumps and one write call per entry, default buffering."""
+    count = 0
+    with open(output, "w", encoding="utf-8") as file:
+        for entry in log_reader(filename):
+            file.write(json.dumps(dict(zip(COLUMNS, _row(entry)))) + "\n")
+            count += 1
+    return count
+
+
+@timer
+@memory_tracker
+def approach_export(filename: str, output: str, fmt: str, **options) -> ExportResult:
+    """Batched serialisation through large buffers, one process."""
+    return export(filename, output, fmt, **options)
+
+
+@timer
+@memory_tracker
+def approach_parallel_export(filename: str, output: str, fmt: str, **options) -> ExportResult:
+    """Batched serialisation on every core, parts concatenated afterwards."""
+    return parallel_export(filename, output, fmt, **options)
+
+
+# ─────────────────────────────────────────────
+#  Run comparison
+# ─────────────────────────────────────────────
+FILE = "./datasets/Android.log"
+OUTPUT = "./datasets/export"
+
+if __name__ == "__main__":
+    print("=" * 50)
+    print("  RAW READ  (no parsing, the ceiling)")
+    print("=" * 50)
+    ceiling = approach_raw_read(FILE)
+    print(f"  Throughput        : {ceiling:.1f} MB/s\n")
+
+    print("=" * 50)
+    print("  PARSE ONLY  (log_reader, nothing written)")
+    print("=" * 50)
+    parse_rate = approach_parse_only(FILE)
+    print(f"  Throughput        : {parse_rate:.1f} MB/s\n")
+
+    print("=" * 50)
+    print("  ROW BY ROW  (json.dumps + write per entry)")
+    print("=" * 50)
+    count = approach_row_by_row(FILE, OUTPUT + ".jsonl")
+    print(f"  Rows written      : {count}\n")
+
+    for fmt in FORMATS:
+        print("=" * 50)
+        print(f"  EXPORT {fmt.upper()}  (batched, 4 MB buffer)")
+        print("=" * 50)
+        result = approach_export(FILE, f"{OUTPUT}.{fmt}", fmt)
+        print(f"  Rows written      : {sum(result.rows)}")
+        print(f"  Throughput        : {result.throughput:.1f} MB/s "
+              f"({result.throughput / ceiling:.1%} of raw read, "
+              f"{result.throughput / parse_rate:.0%} of parse only)\n")
+
+    print("=" * 50)
+    print("  PARALLEL EXPORT  (JSONL, 4 shards by tag)")
+    print("=" * 50)
+    result = approach_parallel_export(FILE, OUTPUT + ".jsonl", "jsonl", shard_by="tag", shards=4)
+    print(f"  Rows written      : {sum(result.rows)}  {result.rows}")
+    print(f"  Throughput        : {result.throughput:.1f} MB/s "
+          f"({result.throughput / ceiling:.1%} of raw read, "
+          f"{result.throughput / parse_rate:.0%} of parse only)\n")
+
+    for path in [OUTPUT + ".csv", OUTPUT + ".jsonl", *result.paths]:
+        if os.path.exists(path):
+            os.remove(path)
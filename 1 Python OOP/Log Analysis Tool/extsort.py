@@ -0,0 +1,211 @@
+import os
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+from init import LogEntry, timer, memory_tracker, log_reader, _byte_range_lines
+from aggregate import key_getter
+from compressed import BUFFER_SIZE
+from merge import entry_key, merge_logs
+from parallel import _plan
+
+DEFAULT_BUDGET = 64 * 1024 * 1024
+ITEM_OVERHEAD = 180             # measured cost of one (tag, line) pair beyond the line's characters
+MAX_FAN_IN = 128                # most runs merged at once, however large the budget
+WRITE_BUFFER = 1024 * 1024
+
+
+def sort_key(key):
+    """Key function for a sort spec.
+
+    "time" orders by timestamp, "level" from V up to F, "severity" from F
+    down to V; any other str or tuple is an aggregate.key_getter key such
+    as "tag", "pid" or ("pid", "tid"). A callable is used as it is.
+    """
+    if callable(key):
+        return key
+    if key == "time":
+        return entry_key
+    if key == "level":
+        return lambda entry: entry.severity
+    if key == "severity":
+        return lambda entry: -entry.severity
+    return key_getter(key)
+
+
+# ─────────────────────────────────────────────
+#  Runs
+# ─────────────────────────────────────────────
+def _write_run(items: list[tuple], folder: str, name: str) -> str:
+    # list.sort is stable, so entries with equal keys stay in log order
+    items.sort(key=lambda item: item[0])
+    path = os.path.join(folder, name)
+    with open(path, "w", encoding="utf-8", buffering=WRITE_BUFFER) as file:
+        file.writelines(line + "\n" for _, line in items)
+    return path
+
+
+def _build_runs(pairs, key, budget: int, folder: str, prefix: str) -> list[str]:
+    """Sort (entry, line) pairs into run files of at most about `budget` bytes of memory each."""
+    get = sort_key(key)
+    runs: list[str] = []
+    items: list[tuple] = []
+    used = 0
+    for entry, line in pairs:
+        items.append((get(entry), line))
+        used += len(line) + ITEM_OVERHEAD
+        if used >= budget:
+            runs.append(_write_run(items, folder, f"{prefix}-{len(runs):05d}.log"))
+            items, used = [], 0
+    if items:
+        runs.append(_write_run(items, folder, f"{prefix}-{len(runs):05d}.log"))
+    return runs
+
+
+def _parsed(lines):
+    parse = LogEntry.parse
+    for raw_line in lines:
+        line = raw_line.strip()
+        entry = parse(line)
+        if entry:
+            yield entry, line
+
+
+def _runs_for_range(filename: str, start: int, end: int, key, budget: int,
+                    folder: str, prefix: str) -> list[str]:
+    return _build_runs(_parsed(_byte_range_lines(filename, start, end)), key, budget, folder, prefix)
+
+
+# ─────────────────────────────────────────────
+#  Merging
+# ─────────────────────────────────────────────
+def _merge_runs(runs: list[str], key, budget: int, folder: str, prefetch: Optional[int]):
+    """k-way merge of sorted runs, in passes when there are too many to open at once.
+
+    Every open run costs one BUFFER_SIZE read buffer, so the fan-in is what
+    the budget can hold (at least 2, at most MAX_FAN_IN). Each pass merges
+    neighbouring runs, so ties still come out in log order.
+    """
+    get = sort_key(key)
+    fan_in = max(2, min(MAX_FAN_IN, budget // BUFFER_SIZE))
+    level = 0
+    while len(runs) > fan_in:
+        merged = []
+        for number in range(0, len(runs), fan_in):
+            group = runs[number:number + fan_in]
+            path = os.path.join(folder, f"pass{level}-{number // fan_in:05d}.log")
+            with open(path, "w", encoding="utf-8", buffering=WRITE_BUFFER) as file:
+                file.writelines(entry.to_line() + "\n"
+                                for entry in merge_logs(group, prefetch, key=get))
+            for run in group:
+                os.remove(run)
+            merged.append(path)
+        runs = merged
+        level += 1
+    yield from merge_logs(runs, prefetch, key=get)
+
+
+# ─────────────────────────────────────────────
+#  External sort
+# ─────────────────────────────────────────────
+def sort_entries(entries, key="time", budget: int = DEFAULT_BUDGET,
+                 folder: Optional[str] = None, prefetch: Optional[int] = None):
+    """Sort any LogEntry stream by `key` (see sort_key) in about `budget` bytes of RAM.
+
+    Entries are gathered until the budget is reached, sorted, and written
+    out as a run; the runs are then merged lazily, in extra passes if the
+    budget cannot hold a read buffer for each. The sort is stable. With
+    prefetch=N each run is read ahead N batches deep; those batches and the
+    read and write buffers (BUFFER_SIZE, WRITE_BUFFER) come on top.
+    Temporary files live in a fresh folder under `folder` and are removed
+    when the generator finishes or is closed.
+    """
+    if not isinstance(budget, int) or isinstance(budget, bool):
+        raise TypeError("Budget must be an integer number of bytes.")
+    if budget < 1:
+        raise ValueError("Budget must be at least 1 byte.")
+    work = tempfile.mkdtemp(prefix="extsort-", dir=folder)
+    try:
+        runs = _build_runs(((entry, entry.to_line()) for entry in entries), key, budget, work, "run")
+        yield from _merge_runs(runs, key, budget, work, prefetch)
+    finally:
+        shutil.rmtree(work, ignore_errors=True)
+
+
+def sort_file(filename: str, key="time", budget: int = DEFAULT_BUDGET,
+              workers: Optional[int] = None, folder: Optional[str] = None,
+              prefetch: Optional[int] = None):
+    """Sort a log by `key` with runs built in parallel, then merged lazily.
+
+    The file is cut into newline-aligned chunks; each worker parses a chunk,
+    sorts it into runs within its share of `budget` (budget / workers) and
+    writes them as plain log lines, so no entries cross process boundaries.
+    Runs are merged in chunk order, keeping the sort stable. A callable key
+    must be picklable (a module-level function). Compressed logs cannot be
+    split and are sorted in one process through sort_entries().
+    """
+    if not isinstance(budget, int) or isinstance(budget, bool):
+        raise TypeError("Budget must be an integer number of bytes.")
+    if budget < 1:
+        raise ValueError("Budget must be at least 1 byte.")
+    workers, ranges = _plan(filename, workers)
+    if ranges is None or workers == 1:
+        yield from sort_entries(log_reader(filename), key, budget, folder, prefetch)
+        return
+    share = max(1, budget // workers)
+    work = tempfile.mkdtemp(prefix="extsort-", dir=folder)
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(_runs_for_range, filename, start, end, key, share, work,
+                                   f"chunk{number:05d}")
+                       for number, (start, end) in enumerate(ranges)]
+            runs = [run for future in futures for run in future.result()]
+        yield from _merge_runs(runs, key, budget, work, prefetch)
+    finally:
+        shutil.rmtree(work, ignore_errors=True)
+
+
+# ─────────────────────────────────────────────
+#  Comparison functions
+# ─────────────────────────────────────────────
+@timer
+@memory_tracker
+def approach_sorted_list(filename: str, key) -> int:
+    """sorted(list(log_reader(...))) — every entry in RAM at once."""
+    return len(sorted(log_reader(filename), key=sort_key(key)))
+
+
+@timer
+@memory_tracker
+def approach_external_sort(filename: str, key, budget: int, workers: Optional[int] = None) -> int:
+    """Sorted runs on disk within the budget, then a lazy k-way merge."""
+    count = 0
+    for entry in sort_file(filename, key, budget, workers):
+        count += 1
+    return count
+
+
+# ─────────────────────────────────────────────
+#  Run comparison
+# ─────────────────────────────────────────────
+FILE = "./datasets/Android.log"
+
+if __name__ == "__main__":
+    print("=" * 50)
+    print("  SORTED LIST  (by tag, all entries in RAM)")
+    print("=" * 50)
+    count = approach_sorted_list(FILE, "tag")
+    print(f"  Entries sorted    : {count}\n")
+
+    print("=" * 50)
+    print("  EXTERNAL SORT  (by tag, 4 MB budget, parallel runs)")
+    print("=" * 50)
+    count = approach_external_sort(FILE, "tag", 4 * 1024 * 1024)
+    print(f"  Entries sorted    : {count}\n")
+
+    print("=" * 50)
+    print("  EXTERNAL SORT  (by severity, 4 MB budget, one process)")
+    print("=" * 50)
+    count = approach_external_sort(FILE, "severity", 4 * 1024 * 1024, workers=1)
+    print(f"  Entries sorted    : {count}\n")
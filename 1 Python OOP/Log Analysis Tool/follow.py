@@ -0,0 +1,177 @@
+import json
+import os
+import time
+from typing import Optional
+
+from init import LogEntry, line_filter, log_reader
+
+POLL_INTERVAL = 0.5
+CHECKPOINT_EVERY = 1000
+MAX_LINE = 64 * 1024
+
+
+# ─────────────────────────────────────────────
+#  Checkpoint
+# ─────────────────────────────────────────────
+class Checkpoint:
+    """Where a follower stopped: byte offset plus the inode it belongs to."""
+
+    def __init__(self, path: str):
+        if not isinstance(path, str):
+            raise TypeError("Checkpoint path must be str.")
+        if not path.strip():
+            raise ValueError("Checkpoint path must not be empty.")
+        self.path = path
+        self.inode: Optional[int] = None
+        self.offset = 0
+        self.load()
+
+    def load(self) -> None:
+        try:
+            with open(self.path, "r", encoding="utf-8") as file:
+                data = json.load(file)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return
+        self.inode = data.get("inode")
+        self.offset = int(data.get("offset", 0))
+
+    def save(self) -> None:
+        temporary = self.path + ".tmp"
+        with open(temporary, "w", encoding="utf-8") as file:
+            json.dump({"inode": self.inode, "offset": self.offset}, file)
+        os.replace(temporary, self.path)
+
+    def __repr__(self) -> str:
+        return f"Checkpoint(path={self.path!r}, inode={self.inode}, offset={self.offset})"
+
+
+# ─────────────────────────────────────────────
+#  Follower
+# ─────────────────────────────────────────────
+def _resume_at(offset: int, overlong: Optional[int]) -> int:
+    # never checkpoint mid-way through an overlong line, or a resume would yield its tail
+    return offset if overlong is None else overlong
+
+
+def follow_lines(filename: str, checkpoint: Optional[Checkpoint] = None,
+                 poll_interval: float = POLL_INTERVAL,
+                 idle_timeout: Optional[float] = None):
+    """Yield complete lines as they are appended to the file, like `tail -F`.
+
+    Resumes from the checkpoint when it belongs to the same inode, starts
+    over on a new inode (rotation) or a shorter file (truncation), and
+    only ever holds one line in memory. Stops after idle_timeout seconds
+    without new data, or never when it is None.
+    """
+    if not isinstance(filename, str):
+        raise TypeError("File name must be str.")
+    if not filename.strip():
+        raise ValueError("File name must not be empty.")
+    if poll_interval <= 0:
+        raise ValueError("Poll interval must be positive.")
+
+    file = None
+    inode = None
+    offset = 0
+    pending = 0                         # lines yielded since the last checkpoint save
+    overlong = None                     # start offset of an overlong line being discarded
+    idle_since = time.monotonic()
+    try:
+        while True:
+            if file is None:
+                try:
+                    file = open(filename, "rb")
+                except FileNotFoundError:
+                    file = None         # rotated away and not recreated yet
+                else:
+                    inode = os.fstat(file.fileno()).st_ino
+                    offset = 0
+                    overlong = None
+                    if checkpoint is not None and checkpoint.inode == inode:
+                        if checkpoint.offset <= os.fstat(file.fileno()).st_size:
+                            offset = checkpoint.offset
+                    file.seek(offset)
+
+            line = file.readline(MAX_LINE) if file is not None else b""
+            if line.endswith(b"\n"):
+                offset += len(line)
+                idle_since = time.monotonic()
+                if overlong is not None:
+                    overlong = None     # the tail of an overlong line: drop it too
+                    continue
+                yield line.decode("utf-8", errors="replace")
+                pending += 1
+                if checkpoint is not None and pending >= CHECKPOINT_EVERY:
+                    checkpoint.inode, checkpoint.offset = inode, offset
+                    checkpoint.save()
+                    pending = 0
+                continue
+            if len(line) == MAX_LINE:
+                if overlong is None:
+                    overlong = offset   # overlong line: discard it piece by piece up to its newline
+                offset += len(line)
+                continue
+            if file is not None:
+                file.seek(offset)       # half-written line: re-read it next poll
+
+            if checkpoint is not None and pending:
+                checkpoint.inode, checkpoint.offset = inode, _resume_at(offset, overlong)
+                checkpoint.save()
+                pending = 0
+            try:
+                stat = os.stat(filename)
+            except FileNotFoundError:
+                stat = None
+            if file is not None and (stat is None or stat.st_ino != inode):
+                file.close()            # rotated: the old file is fully drained
+                file = None
+                if checkpoint is not None:
+                    checkpoint.inode, checkpoint.offset = None, 0
+                continue
+            if file is None and stat is not None:
+                continue                # recreated after rotation: open it now
+            if file is not None and stat.st_size < offset:
+                offset = 0              # truncated in place
+                overlong = None
+                file.seek(0)
+                continue
+            if idle_timeout is not None and time.monotonic() - idle_since >= idle_timeout:
+                return
+            time.sleep(poll_interval)
+    finally:
+        if file is not None:
+            file.close()
+        if checkpoint is not None and inode is not None:
+            checkpoint.inode, checkpoint.offset = inode, _resume_at(offset, overlong)
+            checkpoint.save()
+
+
+def follow_reader(filename: str, checkpoint: Optional[str] = None,
+                  poll_interval: float = POLL_INTERVAL,
+                  idle_timeout: Optional[float] = None, **filters):
+    """Stream LogEntry objects from a growing log, resuming from a checkpoint file."""
+    accept = line_filter(**filters)
+    saved = Checkpoint(checkpoint) if checkpoint is not None else None
+    for raw_line in follow_lines(filename, saved, poll_interval, idle_timeout):
+        line = raw_line.strip()
+        if accept is not None and not accept(line):
+            continue
+        entry = LogEntry.parse(line)
+        if entry:
+            yield entry
+
+
+# ─────────────────────────────────────────────
+#  Run follower
+# ─────────────────────────────────────────────
+FILE = "./datasets/Android.log"
+
+if __name__ == "__main__":
+    print("=" * 50)
+    print("  FOLLOW  (Ctrl+C to stop, resumes from checkpoint)")
+    print("=" * 50)
+    try:
+        for entry in log_reader(FILE, min_level="W", follow=True, checkpoint=FILE + ".checkpoint"):
+            print(entry)
+    except KeyboardInterrupt:
+        print("  Stopped — checkpoint saved.")
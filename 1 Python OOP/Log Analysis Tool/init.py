@@ -1,7 +1,11 @@
+import calendar
+import os
 import re
+import threading
 import time
 import tracemalloc
 from dataclasses import dataclass
+from datetime import datetime
 from typing import Optional
 import functools
 
@@ -34,6 +38,78 @@ def memory_tracker(func):
     return wrapper
 
 
+# ─────────────────────────────────────────────
+#  Timestamps
+# ─────────────────────────────────────────────
+DEFAULT_YEAR = 2000             # a leap year, so 02-29 lines decode and results never depend on today's date
+NO_TIME = -1                    # epoch_ms of a line whose date does not exist, such as 00-00 or 04-31
+
+
+class TimestampDecoder:
+    """Turn 'MM-DD' + 'HH:MM:SS.mmm' into integer milliseconds since the Unix epoch (UTC).
+
+    Android logs carry no year, so one is fixed per decoder (DEFAULT_YEAR
+    unless given). Midnight of each date is computed once and cached;
+    the last whole second is cached too, so consecutive lines from the same
+    second only convert their milliseconds. No datetime in the hot path.
+    decode() never raises on a line LogEntry.parse accepts: a date that
+    does not exist gives NO_TIME. A decoder is not thread-safe: give each
+    thread its own (see decoder()).
+    """
+
+    def __init__(self, year: int = DEFAULT_YEAR):
+        if not isinstance(year, int) or isinstance(year, bool):
+            raise TypeError("Year must be an integer.")
+        self.year = year
+        self._days: dict[str, int] = {}
+        self._date = self._second = None
+        self._base = 0
+
+    def day_ms(self, date: str) -> int:
+        """Midnight of 'MM-DD' in the decoder's year.
+
+        Any date a log can contain is accepted: in a year without 02-29,
+        that date decodes as the day after 02-28 rather than raising.
+        """
+        ms = self._days.get(date)
+        if ms is None:
+            try:
+                month, day = int(date[0:2]), int(date[3:5])
+            except ValueError:
+                raise ValueError(f"Date must look like 'MM-DD': {date!r}") from None
+            if not 1 <= month <= 12 or not 1 <= day <= calendar.monthrange(DEFAULT_YEAR, month)[1]:
+                raise ValueError(f"No such day: {date!r}")
+            # timegm normalises an out-of-range day, so 02-29 of a common year becomes 03-01
+            ms = self._days[date] = calendar.timegm((self.year, month, day, 0, 0, 0)) * 1000
+        return ms
+
+    def decode(self, date: str, time_: str) -> int:
+        second = time_[:8]
+        if second != self._second or date != self._date:
+            try:
+                day = self.day_ms(date)
+            except ValueError:
+                return NO_TIME
+            self._base = (day + int(time_[0:2]) * 3_600_000
+                          + int(time_[3:5]) * 60_000 + int(time_[6:8]) * 1000)
+            self._date, self._second = date, second
+        if len(time_) == 12:
+            return self._base + int(time_[9:12])
+        return self._base + int((time_[9:] + "00")[:3])     # fractions of other widths
+
+
+_DECODERS = threading.local()
+
+
+def decoder() -> TimestampDecoder:
+    """This thread's DEFAULT_YEAR decoder — its last-second cache is never shared across threads."""
+    try:
+        return _DECODERS.decoder
+    except AttributeError:
+        _DECODERS.decoder = TimestampDecoder()
+        return _DECODERS.decoder
+
+
 # ─────────────────────────────────────────────
 #  LogEntry
 # ─────────────────────────────────────────────
@@ -58,11 +134,55 @@ class LogEntry:
         r"(.*)"
     )
 
+    PARSERS = ("regex", "fast")
+    _parser = "regex"
+
+    @classmethod
+    def use_parser(cls, name: str) -> None:
+        """Select the engine behind parse(): "regex" (the reference) or "fast"."""
+        if name not in cls.PARSERS:
+            raise ValueError(f"Unknown parser: {name!r}")
+        cls._parser = name
+
     @classmethod
     def parse(cls, line: str) -> Optional["LogEntry"]:
+        if cls._parser == "fast":
+            return cls.parse_fast(line)
+        return cls.parse_regex(line)
+
+    @classmethod
+    def parse_fast(cls, line: str) -> Optional["LogEntry"]:
+        """Slice the fixed-width date/time, split pid/tid/level once, partition tag from message.
+
+        Every check mirrors a piece of _PATTERN, so an accepted line gives
+        exactly the regex result; anything unusual (tabs, longer fractions,
+        odd digits, empty tags) goes to parse_regex instead.
+        """
+        parts = line.split(None, 5)
+        if len(parts) == 6:
+            date, time_, pid, tid, level, rest = parts
+            # 'MM-DD HH:MM:SS.mmm': separators at 2, 5, 8, 11, 14, digits everywhere else
+            if (len(date) == 5 and len(time_) == 12 and line[2:15:3] == "- ::."
+                    and line[0:18:3].isdecimal() and line[1:18:3].isdecimal() and line[17].isdecimal()
+                    and len(level) == 1 and "A" <= level <= "Z"
+                    and pid.isdecimal() and tid.isdecimal()):
+                tag, colon, message = rest.partition(":")
+                if colon and "\n" not in message:
+                    tag = tag.rstrip()
+                    if tag:
+                        return cls(date, time_, int(pid), int(tid), level, tag, message.strip())
+        return cls.parse_regex(line)
+
+    @classmethod
+    def parse_regex(cls, line: str) -> Optional["LogEntry"]:
         m = cls._PATTERN.match(line)
         if not m:
             return None
+        return cls.from_match(m)
+
+    @classmethod
+    def from_match(cls, m: re.Match) -> "LogEntry":
+        """Build an entry from a successful _PATTERN match."""
         date, time_, pid, tid, level, tag, message = m.groups()
         return cls(
             date=date, time=time_,
@@ -76,6 +196,17 @@ class LogEntry:
     def severity(self) -> int:
         return self.LEVELS.get(self.level, -1)
 
+    @functools.cached_property
+    def epoch_ms(self) -> int:
+        """Timestamp as integer epoch milliseconds, decoded on first use; NO_TIME for a date that does not exist."""
+        return decoder().decode(self.date, self.time)
+
+    def to_line(self) -> str:
+        """The entry as a log line that parse() reads back to an equal entry."""
+        # " :" after the tag keeps an empty tag parseable; parse() strips it back off
+        return (f"{self.date} {self.time} {self.pid} {self.tid} "
+                f"{self.level} {self.tag} : {self.message}")
+
     def __str__(self) -> str:
         return (
             f"┌─ [{self.date}  {self.time}]\n"
@@ -87,19 +218,140 @@ class LogEntry:
         )
 
 
+# ─────────────────────────────────────────────
+#  Filters
+# ─────────────────────────────────────────────
+def _stamp(value: str, name: str) -> tuple[str, str]:
+    if not isinstance(value, str):
+        raise TypeError(f"{name} must be str.")
+    parts = value.split()
+    if not 1 <= len(parts) <= 2:
+        raise ValueError(f"{name} must look like 'MM-DD' or 'MM-DD HH:MM:SS.mmm'.")
+    return parts[0], parts[1] if len(parts) == 2 else ""
+
+
+def line_filter(min_level: Optional[str] = None, tags=None, pids=None,
+                since: Optional[str] = None, until: Optional[str] = None):
+    """Build a raw-line predicate, or None when nothing is filtered.
+
+    The predicate splits off the whitespace-separated prefix once and checks
+    level, pid, tag and the [since, until) window on those substrings. For
+    any line the regex accepts, the split yields exactly the same fields, so
+    a rejected line is one the regex-then-filter path would have dropped too.
+    """
+    levels = None
+    if min_level is not None:
+        if min_level not in LogEntry.LEVELS:
+            raise ValueError(f"Unknown level: {min_level!r}")
+        floor = LogEntry.LEVELS[min_level]
+        levels = {level for level, rank in LogEntry.LEVELS.items() if rank >= floor}
+    if tags is not None:
+        tags = set(tags)
+        if not all(isinstance(tag, str) for tag in tags):
+            raise TypeError("Tags must be str.")
+    if pids is not None:
+        pids = set(pids)
+        if not all(isinstance(pid, int) and not isinstance(pid, bool) for pid in pids):
+            raise TypeError("PIDs must be int.")
+        pids = {str(pid) for pid in pids}
+    if since is not None:
+        since = _stamp(since, "Since")
+    if until is not None:
+        until = _stamp(until, "Until")
+    if levels is None and tags is None and pids is None and since is None and until is None:
+        return None
+
+    def accept(line: str) -> bool:
+        parts = line.split(None, 5)
+        if len(parts) < 6:
+            return False        # the regex needs all six pieces as well
+        if levels is not None and parts[4] not in levels:
+            return False
+        if pids is not None and (parts[2].lstrip("0") or "0") not in pids:
+            return False
+        if since is not None or until is not None:
+            stamp = (parts[0], parts[1])
+            if since is not None and stamp < since:
+                return False
+            if until is not None and stamp >= until:
+                return False
+        if tags is not None and parts[5].split(":", 1)[0].strip() not in tags:
+            return False
+        return True
+
+    return accept
+
+
 # ─────────────────────────────────────────────
 #  Reader
 # ─────────────────────────────────────────────
-def log_reader(filename: str):
+def _byte_range_lines(filename: str, start: int, end: int):
+    with open(filename, "rb") as file:
+        file.seek(start)
+        position = start
+        for raw_line in file:
+            if position >= end:
+                break
+            position += len(raw_line)
+            yield raw_line.decode("utf-8", errors="replace")
+
+
+def log_reader(filename: str, min_level: Optional[str] = None, tags=None, pids=None,
+               since: Optional[str] = None, until: Optional[str] = None,
+               index: bool = False, follow: bool = False,
+               checkpoint: Optional[str] = None, stats=None):
+    """Stream LogEntry objects from a log, optionally filtered, indexed, followed or instrumented.
+
+    Pass a stats.ReaderStats as `stats` to count bytes, lines and parse
+    failures by reason and to time each stage of the read.
+    """
     if not isinstance(filename, str):
         raise TypeError("File name must be str.")
     if not filename.strip():
         raise ValueError("File name must not be empty.")
-    with open(filename, "r", encoding="utf-8", errors="replace") as file:
-        for raw_line in file:
-            entry = LogEntry.parse(raw_line.strip())
-            if entry:
-                yield entry
+    from compressed import detect_codec, open_log       # compressed builds on this module
+    if (index or follow) and os.path.exists(filename) and detect_codec(filename) is not None:
+        raise ValueError("Index and follow modes need an uncompressed log.")
+    if follow:
+        if index:
+            raise ValueError("Follow mode cannot use the time index.")
+        if stats is not None:
+            raise ValueError("Follow mode does not collect stats.")
+        from follow import follow_reader        # follow builds on this module
+        yield from follow_reader(filename, checkpoint, min_level=min_level, tags=tags,
+                                 pids=pids, since=since, until=until)
+        return
+    accept = line_filter(min_level, tags, pids, since, until)
+    if index:
+        if since is None and until is None:
+            raise ValueError("Index mode needs since and/or until.")
+        from time_index import TimeIndex        # time_index builds on this module
+        start, end = TimeIndex.open(filename).byte_range(since, until)
+        if stats is not None:
+            from stats import decoded_lines, instrumented_entries      # stats builds on this module
+            with open(filename, "rb") as file:
+                file.seek(start)
+                yield from instrumented_entries(decoded_lines(file, stats, end - start), accept, stats)
+            return
+        lines = _byte_range_lines(filename, start, end)
+        yield from _parse_lines(lines, accept)
+        return
+    with open_log(filename) as file:
+        if stats is not None:
+            from stats import decoded_lines, instrumented_entries      # stats builds on this module
+            yield from instrumented_entries(decoded_lines(file.buffer, stats), accept, stats)
+            return
+        yield from _parse_lines(file, accept)
+
+
+def _parse_lines(lines, accept):
+    for raw_line in lines:
+        line = raw_line.strip()
+        if accept is not None and not accept(line):
+            continue
+        entry = LogEntry.parse(line)
+        if entry:
+            yield entry
 
 
 # ─────────────────────────────────────────────
@@ -123,19 +375,91 @@ def approach_list(filename: str) -> int:
     return len(entries)
 
 
+@timer
+@memory_tracker
+def approach_filter_after(filename: str, min_level: str, tags: set) -> int:
+    """Parses every line into a LogEntry, then throws most of them away."""
+    count = 0
+    floor = LogEntry.LEVELS[min_level]
+    for entry in log_reader(filename):
+        if entry.severity >= floor and entry.tag in tags:
+            count += 1
+    return count
+
+
+@timer
+@memory_tracker
+def approach_pushdown(filename: str, min_level: str, tags: set) -> int:
+    """Rejects lines on their raw prefix — only survivors reach the regex."""
+    count = 0
+    for entry in log_reader(filename, min_level=min_level, tags=tags):
+        count += 1
+    return count
+
+
+@timer
+@memory_tracker
+def approach_strptime(stamps: list[tuple[str, str]], year: int) -> int:
+    """Decodes every timestamp with datetime.strptime."""
+    total = 0
+    for date, time_ in stamps:
+        moment = datetime.strptime(f"{year}-{date} {time_}", "%Y-%m-%d %H:%M:%S.%f")
+        total += calendar.timegm(moment.timetuple()) * 1000 + moment.microsecond // 1000
+    return total
+
+
+@timer
+@memory_tracker
+def approach_epoch_decoder(stamps: list[tuple[str, str]], year: int) -> int:
+    """Decodes every timestamp with the cached integer decoder."""
+    decode = TimestampDecoder(year).decode
+    total = 0
+    for date, time_ in stamps:
+        total += decode(date, time_)
+    return total
+
+
 # ─────────────────────────────────────────────
 #  Run comparison
 # ─────────────────────────────────────────────
 FILE = "./datasets/Android.log"
 
-print("=" * 50)
-print("  GENERATOR  (lazy, one line at a time)")
-print("=" * 50)
-count = approach_generator(FILE)
-print(f"  Entries processed : {count}\n")
-
-print("=" * 50)
-print("  LIST  (eager, entire file into RAM)")
-print("=" * 50)
-count = approach_list(FILE)
-print(f"  Entries loaded    : {count}\n")
+if __name__ == "__main__":
+    print("=" * 50)
+    print("  GENERATOR  (lazy, one line at a time)")
+    print("=" * 50)
+    count = approach_generator(FILE)
+    print(f"  Entries processed : {count}\n")
+
+    print("=" * 50)
+    print("  LIST  (eager, entire file into RAM)")
+    print("=" * 50)
+    count = approach_list(FILE)
+    print(f"  Entries loaded    : {count}\n")
+
+    print("=" * 50)
+    print("  FILTER AFTER PARSING  (level >= W, tag = ActivityManager)")
+    print("=" * 50)
+    count = approach_filter_after(FILE, "W", {"ActivityManager"})
+    print(f"  Entries matched   : {count}\n")
+
+    print("=" * 50)
+    print("  PUSHDOWN  (level >= W, tag = ActivityManager)")
+    print("=" * 50)
+    count = approach_pushdown(FILE, "W", {"ActivityManager"})
+    print(f"  Entries matched   : {count}\n")
+
+    stamps = [(entry.date, entry.time) for entry in log_reader(FILE)]
+    year = DEFAULT_YEAR
+
+    print("=" * 50)
+    print("  STRPTIME  (datetime per timestamp)")
+    print("=" * 50)
+    total = approach_strptime(stamps, year)
+    print(f"  Checksum          : {total}\n")
+
+    print("=" * 50)
+    print("  EPOCH DECODER  (cached date + second)")
+    print("=" * 50)
+    total = approach_epoch_decoder(stamps, year)
+    print(f"  Checksum          : {total}\n")
@@ -0,0 +1,171 @@
+import heapq
+import queue
+import threading
+from typing import Optional
+
+from init import LogEntry, timer, memory_tracker, log_reader
+
+PREFETCH_BATCH = 512
+_DONE = object()
+
+
+def entry_key(entry: LogEntry) -> tuple[str, str]:
+    """Merge key: 'MM-DD' and 'HH:MM:SS.mmm' are fixed-width, so string order is time order."""
+    return entry.date, entry.time
+
+
+# ─────────────────────────────────────────────
+#  Prefetching
+# ─────────────────────────────────────────────
+class Prefetcher:
+    """Read an iterator on a background thread, keeping up to `depth` batches ready.
+
+    A slow disk then stalls only its own thread instead of the whole merge.
+    close() stops the thread even if the consumer gives up early.
+    """
+
+    def __init__(self, iterable, depth: int):
+        if not isinstance(depth, int) or isinstance(depth, bool):
+            raise TypeError("Prefetch depth must be an integer.")
+        if depth < 1:
+            raise ValueError("Prefetch depth must be at least 1.")
+        self._queue: queue.Queue = queue.Queue(maxsize=depth)
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._fill, args=(iter(iterable),), daemon=True)
+        self._thread.start()
+
+    def _put(self, item) -> bool:
+        while not self._stop.is_set():
+            try:
+                self._queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _fill(self, iterator) -> None:
+        batch = []
+        try:
+            for item in iterator:
+                batch.append(item)
+                if len(batch) >= PREFETCH_BATCH:
+                    if not self._put(batch):
+                        return
+                    batch = []
+            if batch:
+                self._put(batch)
+        except BaseException as error:      # re-raised on the consumer's side
+            self._put(error)
+            return
+        self._put(_DONE)
+
+    def __iter__(self):
+        try:
+            while True:
+                batch = self._queue.get()
+                if batch is _DONE:
+                    return
+                if isinstance(batch, BaseException):
+                    raise batch
+                yield from batch
+        finally:
+            self.close()
+
+    def close(self) -> None:
+        self._stop.set()
+
+
+# ─────────────────────────────────────────────
+#  Merge
+# ─────────────────────────────────────────────
+def merge_logs(paths, prefetch: Optional[int] = None, with_source: bool = False,
+               key=entry_key, **filters):
+    """Lazily interleave several logs by timestamp through a heap.
+
+    Each file gets its own log_reader (filters are passed through), and the
+    heap only ever holds one entry per file, so memory stays O(number of
+    files). Entries with equal timestamps keep the order of `paths`. Logs
+    sorted by something else merge the same way when given that `key`. With
+    prefetch=N each file is read ahead on its own thread, N batches deep.
+    With with_source=True, (path, entry) pairs are yielded.
+    """
+    paths = list(paths)
+    if not paths:
+        return
+    for path in paths:
+        if not isinstance(path, str):
+            raise TypeError("File name must be str.")
+    readers = []
+    for path in paths:
+        reader = log_reader(path, **filters)
+        readers.append(Prefetcher(reader, prefetch) if prefetch else reader)
+    if with_source:
+        streams = [((path, entry) for entry in reader) for path, reader in zip(paths, readers)]
+        merge_key = lambda pair: key(pair[1])
+    else:
+        streams, merge_key = readers, key
+    try:
+        yield from heapq.merge(*streams, key=merge_key)
+    finally:
+        for reader in readers:
+            reader.close()
+
+
+# ─────────────────────────────────────────────
+#  Comparison functions
+# ─────────────────────────────────────────────
+@timer
+@memory_tracker
+def approach_sort_all(paths: list[str]) -> int:
+    """Loads every file, concatenates and sorts — all entries in RAM."""
+    entries = [entry for path in paths for entry in log_reader(path)]
+    entries.sort(key=entry_key)
+    return len(entries)
+
+
+@timer
+@memory_tracker
+def approach_merge(paths: list[str], prefetch: Optional[int] = None) -> int:
+    """Heap merge of one lazy reader per file."""
+    count = 0
+    for entry in merge_logs(paths, prefetch=prefetch):
+        count += 1
+    return count
+
+
+# ─────────────────────────────────────────────
+#  Run comparison
+# ─────────────────────────────────────────────
+FILE = "./datasets/Android.log"
+
+if __name__ == "__main__":
+    import os
+    import tempfile
+
+    with tempfile.TemporaryDirectory() as folder:
+        # Deal the sample's lines round-robin into four "devices", each still time-ordered.
+        devices = [os.path.join(folder, f"device-{number}.log") for number in range(4)]
+        outputs = [open(path, "w", encoding="utf-8") for path in devices]
+        with open(FILE, "r", encoding="utf-8", errors="replace") as file:
+            for number, line in enumerate(file):
+                outputs[number % len(outputs)].write(line)
+        for output in outputs:
+            output.close()
+
+        print("=" * 50)
+        print("  SORT ALL  (load everything, then sort)")
+        print("=" * 50)
+        count = approach_sort_all(devices)
+        print(f"  Entries merged    : {count}\n")
+
+        print("=" * 50)
+        print("  HEAP MERGE  (one lazy reader per file)")
+        print("=" * 50)
+        count = approach_merge(devices)
+        print(f"  Entries merged    : {count}\n")
+
+        print("=" * 50)
+        print("  HEAP MERGE  (threaded prefetch, 4 batches deep)")
+        print("=" * 50)
+        count = approach_merge(devices, prefetch=4)
+        print(f"  Entries merged    : {count}\n")
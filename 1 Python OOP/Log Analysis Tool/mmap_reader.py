@@ -0,0 +1,132 @@
+import mmap
+import os
+import re
+from contextlib import ExitStack
+from typing import Optional
+
+from init import LogEntry, timer, memory_tracker, approach_generator
+from compressed import detect_codec, open_log
+
+FIELDS = ("date", "time", "pid", "tid", "level", "tag", "message")
+
+# Bytes twin of LogEntry._PATTERN. Whitespace and the tag class are kept
+# on one line so finditer can sweep the whole mapped buffer in C without
+# a match ever running into the next line.
+_BYTES_PATTERN = re.compile(
+    rb"^[ \t]*(\d{2}-\d{2})[ \t]+"
+    rb"(\d{2}:\d{2}:\d{2}\.\d+)"
+    rb"[ \t]+(\d+)[ \t]+(\d+)"
+    rb"[ \t]+([A-Z])[ \t]+"
+    rb"([^:\n]+):[ \t]*"
+    rb"(.*)",
+    re.MULTILINE,
+)
+
+
+def _text(value: bytes) -> str:
+    return value.decode("utf-8", errors="replace").strip()
+
+
+_CONVERTERS = {
+    "date": lambda value: value.decode("ascii"),
+    "time": lambda value: value.decode("ascii"),
+    "pid": int,
+    "tid": int,
+    "level": lambda value: value.decode("ascii"),
+    "tag": _text,
+    "message": _text,
+}
+
+
+# ─────────────────────────────────────────────
+#  Reader
+# ─────────────────────────────────────────────
+def mmap_reader(filename: str, fields: Optional[tuple[str, ...]] = None):
+    """Match the memory-mapped file as bytes and decode only the requested fields.
+
+    Without fields every match becomes a LogEntry; with fields each match
+    becomes a tuple of just those values, in the order asked for.
+    Compressed logs cannot be mapped; they are decompressed through
+    open_log and matched line by line, with the same results.
+    """
+    if not isinstance(filename, str):
+        raise TypeError("File name must be str.")
+    if not filename.strip():
+        raise ValueError("File name must not be empty.")
+    if fields is not None:
+        unknown = [name for name in fields if name not in _CONVERTERS]
+        if unknown:
+            raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+    with ExitStack() as stack:
+        if detect_codec(filename) is not None:
+            # a compressed log cannot be mapped: match its decompressed lines one at a time
+            text = stack.enter_context(open_log(filename))
+            matches = filter(None, map(_BYTES_PATTERN.match, text.buffer))
+        else:
+            if os.path.getsize(filename) == 0:
+                return                  # mmap refuses empty files
+            file = stack.enter_context(open(filename, "rb"))
+            buffer = stack.enter_context(mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ))
+            matches = _BYTES_PATTERN.finditer(buffer)
+        if fields is None:
+            for m in matches:
+                date, time_, pid, tid, level, tag, message = m.groups()
+                yield LogEntry(
+                    date=date.decode("ascii"), time=time_.decode("ascii"),
+                    pid=int(pid), tid=int(tid),
+                    level=level.decode("ascii"),
+                    tag=_text(tag),
+                    message=_text(message),
+                )
+            return
+        plan = [(FIELDS.index(name) + 1, _CONVERTERS[name]) for name in fields]
+        for m in matches:
+            yield tuple(convert(m.group(group)) for group, convert in plan)
+
+
+# ─────────────────────────────────────────────
+#  Comparison functions
+# ─────────────────────────────────────────────
+@timer
+@memory_tracker
+def approach_mmap(filename: str) -> int:
+    """Streams LogEntry objects straight from the mapped bytes."""
+    count = 0
+    for entry in mmap_reader(filename):
+        count += 1
+    return count
+
+
+@timer
+@memory_tracker
+def approach_mmap_fields(filename: str) -> int:
+    """Decodes only level and tag — the rest of the line stays as raw bytes."""
+    count = 0
+    for level, tag in mmap_reader(filename, fields=("level", "tag")):
+        count += 1
+    return count
+
+
+# ─────────────────────────────────────────────
+#  Run comparison
+# ─────────────────────────────────────────────
+FILE = "./datasets/Android.log"
+
+if __name__ == "__main__":
+    print("=" * 50)
+    print("  GENERATOR  (text mode, decode every line)")
+    print("=" * 50)
+    count = approach_generator(FILE)
+    print(f"  Entries processed : {count}\n")
+
+    print("=" * 50)
+    print("  MMAP  (bytes regex, full LogEntry)")
+    print("=" * 50)
+    count = approach_mmap(FILE)
+    print(f"  Entries processed : {count}\n")
+
+    print("=" * 50)
+    print("  MMAP  (bytes regex, level + tag only)")
+    print("=" * 50)
+    count = approach_mmap_fields(FILE)
+    print(f"  Entries processed : {count}\n")
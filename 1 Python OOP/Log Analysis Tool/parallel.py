@@ -0,0 +1,200 @@
+import io
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from itertools import islice
+from typing import Optional
+
+from init import LogEntry, timer, memory_tracker, log_reader, approach_generator
+from compressed import detect_codec
+
+# More, smaller chunks than workers keep every core busy until the end.
+CHUNKS_PER_WORKER = 4
+IN_FLIGHT_PER_WORKER = 2       # chunks submitted ahead per worker by parallel_reader
+READ_BUFFER = 1024 * 1024
+
+
+# ─────────────────────────────────────────────
+#  Byte ranges
+# ─────────────────────────────────────────────
+def chunk_ranges(filename: str, chunks: int, start: int = 0,
+                 end: Optional[int] = None) -> list[tuple[int, int]]:
+    """Split [start, end) of the file into byte ranges that start and end on newline boundaries.
+
+    start must itself sit on a line boundary; end defaults to the file size.
+    """
+    if not isinstance(chunks, int) or isinstance(chunks, bool):
+        raise TypeError("Chunks must be an integer.")
+    if chunks < 1:
+        raise ValueError("Chunks must be at least 1.")
+    if end is None:
+        end = os.path.getsize(filename)
+    if end <= start:
+        return []
+    step = max(1, (end - start) // chunks)
+    bounds = [start]
+    with open(filename, "rb") as file:
+        for offset in range(start + step, end, step):
+            if offset <= bounds[-1]:
+                continue
+            file.seek(offset - 1)
+            file.readline()            # finish the line the offset landed in
+            position = file.tell()
+            if position >= end:
+                break
+            bounds.append(position)
+    bounds.append(end)
+    return list(zip(bounds, bounds[1:]))
+
+
+class _RangeReader(io.RawIOBase):
+    """Raw reads confined to [start, end) of a file, so a TextIOWrapper can stream just that range."""
+
+    def __init__(self, filename: str, start: int, end: int):
+        self._file = open(filename, "rb", buffering=0)
+        self._file.seek(start)
+        self._left = end - start
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        size = min(len(buffer), self._left)
+        if size <= 0:
+            return 0
+        count = self._file.readinto(memoryview(buffer)[:size])
+        self._left -= count
+        return count
+
+    def close(self) -> None:
+        self._file.close()
+        super().close()
+
+
+def range_lines(filename: str, start: int, end: int):
+    """Stream the text lines of the byte range [start, end), READ_BUFFER bytes at a time.
+
+    Decoding and newline handling match log_reader's text mode, so counts
+    match too.
+    """
+    raw = io.BufferedReader(_RangeReader(filename, start, end), buffer_size=READ_BUFFER)
+    with io.TextIOWrapper(raw, encoding="utf-8", errors="replace") as text:
+        yield from text
+
+
+def read_range(filename: str, start: int, end: int):
+    """Yield every LogEntry whose line lies inside the byte range [start, end)."""
+    parse = LogEntry.parse
+    for raw_line in range_lines(filename, start, end):
+        entry = parse(raw_line.strip())
+        if entry:
+            yield entry
+
+
+def _parse_range(filename: str, start: int, end: int) -> list[LogEntry]:
+    return list(read_range(filename, start, end))
+
+
+def _count_range(filename: str, start: int, end: int) -> int:
+    return sum(1 for _ in read_range(filename, start, end))
+
+
+# ─────────────────────────────────────────────
+#  Parallel reader
+# ─────────────────────────────────────────────
+def _plan(filename: str, workers: Optional[int]) -> tuple[int, Optional[list[tuple[int, int]]]]:
+    """Checked worker count and newline-aligned chunks for the pool.
+
+    A compressed log cannot be split into byte ranges, so its ranges are
+    None; every caller then reads it as one stream through log_reader.
+    """
+    if not isinstance(filename, str):
+        raise TypeError("File name must be str.")
+    if not filename.strip():
+        raise ValueError("File name must not be empty.")
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if not isinstance(workers, int) or isinstance(workers, bool):
+        raise TypeError("Workers must be an integer.")
+    if workers < 1:
+        raise ValueError("Workers must be at least 1.")
+    if detect_codec(filename) is not None:
+        return workers, None
+    return workers, chunk_ranges(filename, workers * CHUNKS_PER_WORKER)
+
+
+def parallel_reader(filename: str, workers: Optional[int] = None, ordered: bool = True):
+    """Parse newline-aligned chunks in a process pool and yield LogEntry objects.
+
+    With ordered=True entries come back in file order; otherwise each chunk
+    is yielded as soon as its worker finishes. At most
+    IN_FLIGHT_PER_WORKER chunks per worker are submitted or waiting at a
+    time, and a chunk is dropped once yielded, so the parent never holds
+    more than that many parsed chunks. A compressed log is read in one
+    process, in order.
+    """
+    workers, ranges = _plan(filename, workers)
+    if ranges is None:
+        yield from log_reader(filename)
+        return
+    if not ranges:
+        return
+    chunks = iter(ranges)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = [pool.submit(_parse_range, filename, start, end)
+                   for start, end in islice(chunks, workers * IN_FLIGHT_PER_WORKER)]
+        while pending:
+            if ordered:
+                future = pending.pop(0)
+            else:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                future = next(iter(done))
+                pending.remove(future)
+            for start, end in islice(chunks, 1):
+                pending.append(pool.submit(_parse_range, filename, start, end))
+            entries = future.result()
+            del future
+            yield from entries
+            del entries
+
+
+def parallel_count(filename: str, workers: Optional[int] = None) -> int:
+    """Count entries in parallel without shipping LogEntry objects between processes."""
+    workers, ranges = _plan(filename, workers)
+    if ranges is None:
+        return sum(1 for _ in log_reader(filename))
+    if not ranges:
+        return 0
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(_count_range, filename, start, end)
+                   for start, end in ranges]
+        return sum(future.result() for future in futures)
+
+
+# ─────────────────────────────────────────────
+#  Comparison functions
+# ─────────────────────────────────────────────
+@timer
+@memory_tracker
+def approach_parallel(filename: str, workers: Optional[int] = None) -> int:
+    """Parses chunks on every core — only the counts cross process boundaries."""
+    return parallel_count(filename, workers)
+
+
+# ─────────────────────────────────────────────
+#  Run comparison
+# ─────────────────────────────────────────────
+FILE = "./datasets/Android.log"
+
+if __name__ == "__main__":
+    print("=" * 50)
+    print("  GENERATOR  (single core)")
+    print("=" * 50)
+    count = approach_generator(FILE)
+    print(f"  Entries processed : {count}\n")
+
+    for workers in sorted({1, 2, os.cpu_count() or 1}):
+        print("=" * 50)
+        print(f"  PARALLEL  ({workers} worker{'s' if workers > 1 else ''})")
+        print("=" * 50)
+        count = approach_parallel(FILE, workers)
+        print(f"  Entries processed : {count}\n")
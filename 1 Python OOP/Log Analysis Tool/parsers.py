@@ -0,0 +1,75 @@
+import sys
+from typing import Optional
+
+from init import LogEntry, timer, memory_tracker, log_reader
+from compressed import open_log
+
+
+# ─────────────────────────────────────────────
+#  Differential check
+# ─────────────────────────────────────────────
+def differential_check(filename: str, limit: Optional[int] = None) -> list[tuple]:
+    """Parse every line with both engines; return (line number, line, regex, fast) for each disagreement.
+
+    The regex engine is the reference: an empty list means the fast engine
+    is safe to use on this file. Stops after `limit` mismatches if given.
+    """
+    if not isinstance(filename, str):
+        raise TypeError("File name must be str.")
+    mismatches = []
+    with open_log(filename) as file:
+        for number, raw_line in enumerate(file, 1):
+            line = raw_line.strip()
+            expected = LogEntry.parse_regex(line)
+            actual = LogEntry.parse_fast(line)
+            if expected != actual:
+                mismatches.append((number, line, expected, actual))
+                if limit is not None and len(mismatches) >= limit:
+                    break
+    return mismatches
+
+
+# ─────────────────────────────────────────────
+#  Comparison functions
+# ─────────────────────────────────────────────
+@timer
+@memory_tracker
+def approach_parser(filename: str, parser: str) -> int:
+    """Streams the file through log_reader with the chosen parse engine."""
+    previous = LogEntry._parser
+    LogEntry.use_parser(parser)
+    try:
+        count = 0
+        for entry in log_reader(filename):
+            count += 1
+        return count
+    finally:
+        LogEntry.use_parser(previous)
+
+
+# ─────────────────────────────────────────────
+#  Run comparison
+# ─────────────────────────────────────────────
+FILE = "./datasets/Android.log"
+
+if __name__ == "__main__":
+    print("=" * 50)
+    print("  REGEX PARSER  (reference, seven groups)")
+    print("=" * 50)
+    count = approach_parser(FILE, "regex")
+    print(f"  Entries processed : {count}\n")
+
+    print("=" * 50)
+    print("  FAST PARSER  (fixed columns + one split)")
+    print("=" * 50)
+    count = approach_parser(FILE, "fast")
+    print(f"  Entries processed : {count}\n")
+
+    print("=" * 50)
+    print("  DIFFERENTIAL CHECK  (fast vs regex)")
+    print("=" * 50)
+    mismatches = differential_check(FILE, limit=10)
+    for number, line, expected, actual in mismatches:
+        print(f"  line {number}: {line!r}\n    regex: {expected!r}\n    fast : {actual!r}")
+    print(f"  Mismatches        : {len(mismatches)}\n")
+    sys.exit(1 if mismatches else 0)
@@ -0,0 +1,335 @@
+import operator
+import re
+from collections import Counter
+from typing import Optional
+
+from init import LogEntry, timer, memory_tracker, log_reader
+from sampling import reservoir_sample
+
+FIELDS = {
+    "date": "date", "time": "time",
+    "pid": "pid", "tid": "tid",
+    "level": "level", "tag": "tag",
+    "msg": "message", "message": "message",
+}
+NUMERIC = {"pid", "tid"}
+COMPARISONS = {"=": "==", "==": "==", "!=": "!=", "<": "<", "<=": "<=", ">": ">", ">=": ">="}
+_RANKS = {"<": operator.lt, "<=": operator.le, ">": operator.gt, ">=": operator.ge}
+
+_TOKEN = re.compile(r"""\s*(?:
+    (?P<string>"(?:[^"\\]|\\.)*"|'(?:[^'\\]|\\.)*')
+  | (?P<op>>=|<=|!=|==|!~|=|<|>|~|\(|\)|,)
+  | (?P<word>[^\s()<>=!~,"']+)
+)""", re.VERBOSE)
+_REGEX_META = re.compile(r"[\\.^$*+?{}\[\]|()]")
+
+
+# ─────────────────────────────────────────────
+#  Parsing
+# ─────────────────────────────────────────────
+def tokenize(text: str) -> list[tuple[str, str, int]]:
+    """Split a query into (kind, value, position) tokens; kind is string, op, word or keyword."""
+    tokens = []
+    position = 0
+    text = text.rstrip()
+    while position < len(text):
+        match = _TOKEN.match(text, position)
+        if match is None or match.end() == position:
+            raise ValueError(f"Unexpected character at position {position}: {text[position:]!r}")
+        kind = match.lastgroup
+        value, start = match.group(kind), match.start(kind)
+        if kind == "string":
+            quote = value[0]
+            value = value[1:-1].replace("\\" + quote, quote)
+        elif kind == "word" and value.lower() in ("and", "or", "not", "in"):
+            kind, value = "keyword", value.lower()
+        tokens.append((kind, value, start))
+        position = match.end()
+    return tokens
+
+
+class _Parser:
+    """Recursive descent over: or → and ('or' and)*, and → not ('and' not)*,
+    not → 'not' not | '(' or ')' | field op value | field 'in' '(' value, ... ')'."""
+
+    def __init__(self, text: str):
+        self.text = text
+        self.tokens = tokenize(text)
+        self.index = 0
+
+    def _peek(self):
+        return self.tokens[self.index] if self.index < len(self.tokens) else (None, None, len(self.text))
+
+    def _take(self, kind=None, value=None):
+        token = self._peek()
+        if token[0] is None or (kind and token[0] != kind) or (value and token[1] != value):
+            wanted = value or kind or "more input"
+            found = repr(token[1]) if token[0] else "end of query"
+            raise ValueError(f"Expected {wanted} at position {token[2]}, found {found}.")
+        self.index += 1
+        return token
+
+    def parse(self):
+        if not self.tokens:
+            raise ValueError("Query must not be empty.")
+        node = self._or()
+        if self.index < len(self.tokens):
+            _, value, position = self.tokens[self.index]
+            raise ValueError(f"Unexpected {value!r} at position {position}.")
+        return node
+
+    def _or(self):
+        nodes = [self._and()]
+        while self._peek()[:2] == ("keyword", "or"):
+            self.index += 1
+            nodes.append(self._and())
+        return nodes[0] if len(nodes) == 1 else ("or", nodes)
+
+    def _and(self):
+        nodes = [self._not()]
+        while self._peek()[:2] == ("keyword", "and"):
+            self.index += 1
+            nodes.append(self._not())
+        return nodes[0] if len(nodes) == 1 else ("and", nodes)
+
+    def _not(self):
+        kind, value, _ = self._peek()
+        if (kind, value) == ("keyword", "not"):
+            self.index += 1
+            return ("not", self._not())
+        if (kind, value) == ("op", "("):
+            self.index += 1
+            node = self._or()
+            self._take("op", ")")
+            return node
+        return self._comparison()
+
+    def _comparison(self):
+        _, name, position = self._take("word")
+        field = FIELDS.get(name.lower())
+        if field is None:
+            raise ValueError(f"Unknown field {name!r} at position {position}; "
+                             f"use one of {', '.join(sorted(FIELDS))}.")
+        kind, op, position = self._peek()
+        if (kind, op) == ("keyword", "in"):
+            self.index += 1
+            self._take("op", "(")
+            values = [self._value(field)]
+            while self._peek()[:2] == ("op", ","):
+                self.index += 1
+                values.append(self._value(field))
+            self._take("op", ")")
+            return ("cmp", field, "in", values)
+        if kind != "op" or op not in COMPARISONS and op not in ("~", "!~"):
+            raise ValueError(f"Expected a comparison after {name!r} at position {position}.")
+        self.index += 1
+        return ("cmp", field, op, self._value(field, regex=op in ("~", "!~")))
+
+    def _value(self, field: str, regex: bool = False):
+        kind, value, position = self._peek()
+        if kind not in ("string", "word"):
+            raise ValueError(f"Expected a value at position {position}.")
+        self.index += 1
+        if field in NUMERIC and not regex:
+            if not value.isdigit():
+                raise ValueError(f"{field} needs a number at position {position}, got {value!r}.")
+            return int(value)
+        if field == "level" and not regex and value not in LogEntry.LEVELS:
+            raise ValueError(f"Unknown level {value!r} at position {position}.")
+        return value
+
+
+def parse(text: str):
+    """Parse a query into a small tuple tree: ('and'|'or', [nodes]), ('not', node), ('cmp', field, op, value)."""
+    if not isinstance(text, str):
+        raise TypeError("Query must be str.")
+    return _Parser(text).parse()
+
+
+# ─────────────────────────────────────────────
+#  Compiling
+# ─────────────────────────────────────────────
+class _Compiler:
+    """Turn a parsed tree into the source of one lambda; constants become bound names."""
+
+    def __init__(self):
+        self.names: dict[str, object] = {}
+
+    def constant(self, value) -> str:
+        name = f"_c{len(self.names)}"
+        self.names[name] = value
+        return name
+
+    def emit(self, node) -> tuple[str, int]:
+        """Return (source, cost). Cost orders and/or operands: field checks before regex."""
+        kind = node[0]
+        if kind in ("and", "or"):
+            parts = sorted((self.emit(child) for child in node[1]), key=lambda part: part[1])
+            return "(" + f" {kind} ".join(source for source, _ in parts) + ")", max(c for _, c in parts)
+        if kind == "not":
+            source, cost = self.emit(node[1])
+            return f"(not {source})", cost
+        return self.comparison(*node[1:])
+
+    def comparison(self, field: str, op: str, value) -> tuple[str, int]:
+        attribute = f"e.{field}"
+        if op in ("~", "!~"):
+            negate = "not " if op == "!~" else ""
+            text = f"str({attribute})" if field in NUMERIC else attribute
+            if not _REGEX_META.search(value):       # a plain substring needs no regex
+                return f"({negate}{self.constant(value)} in {text})", 2
+            try:
+                search = re.compile(value).search
+            except re.error as error:
+                raise ValueError(f"Bad regular expression {value!r}: {error}") from None
+            source = f"{self.constant(search)}({text})"
+            return (f"({source} is None)" if negate else f"({source} is not None)"), 3
+        if op == "in":
+            return f"({attribute} in {self.constant(frozenset(value))})", 1
+        if field == "level" and op not in ("=", "==", "!="):
+            # level order is severity order, not letter order
+            rank = LogEntry.LEVELS[value]
+            allowed = frozenset(level for level, other in LogEntry.LEVELS.items()
+                                if _RANKS[op](other, rank))
+            return f"({attribute} in {self.constant(allowed)})", 1
+        return f"({attribute} {COMPARISONS[op]} {self.constant(value)})", 1
+
+
+def pushdown(node) -> dict:
+    """log_reader filters implied by top-level 'and' terms, for raw-line rejection before the regex.
+
+    Each filter is implied by the query, so the compiled predicate, which
+    still checks everything, sees a superset of its own matches.
+    """
+    filters: dict = {}
+    terms = node[1] if node[0] == "and" else [node]
+    for term in terms:
+        if term[0] != "cmp":
+            continue
+        _, field, op, value = term
+        values = value if op == "in" else [value] if op in ("=", "==") else None
+        if field == "level" and op in (">=", ">", "=", "==") and "min_level" not in filters:
+            rank = LogEntry.LEVELS[value] + (op == ">")
+            floor = [level for level, other in LogEntry.LEVELS.items() if other == rank]
+            if floor:
+                filters["min_level"] = floor[0]
+        elif field == "level" and op == "in" and "min_level" not in filters:
+            lowest = min(LogEntry.LEVELS[level] for level in value)
+            filters["min_level"] = next(level for level, other in LogEntry.LEVELS.items()
+                                        if other == lowest)
+        elif field == "tag" and values is not None and "tags" not in filters:
+            filters["tags"] = set(values)
+        elif field == "pid" and values is not None and "pids" not in filters:
+            filters["pids"] = set(values)
+    return filters
+
+
+# ─────────────────────────────────────────────
+#  Query
+# ─────────────────────────────────────────────
+class Query:
+    """A query compiled once into a single predicate plus log_reader pushdown filters.
+
+        Query('level>=W and tag in (ActivityManager, PowerManager) and msg~"timeout"')
+
+    Operators: = != < <= > >= on any field (level compares by severity),
+    `in (a, b)`, `~` / `!~` for regex search (plain text becomes a substring
+    test), combined with and / or / not and parentheses.
+    """
+
+    def __init__(self, text: str):
+        self.text = text
+        self.tree = parse(text)
+        compiler = _Compiler()
+        body, _ = compiler.emit(self.tree)
+        self.source = f"lambda e: {body}"
+        self.predicate = eval(self.source, {"__builtins__": {"str": str}, **compiler.names})
+        self.filters = pushdown(self.tree)
+
+    def __call__(self, entry: LogEntry) -> bool:
+        return self.predicate(entry)
+
+    ####################### Outputs #######################
+
+    def entries(self, filename: str):
+        """Stream matching entries, with the pushdown filters applied inside log_reader."""
+        predicate = self.predicate
+        for entry in log_reader(filename, **self.filters):
+            if predicate(entry):
+                yield entry
+
+    def count(self, filename: str) -> int:
+        return sum(1 for _ in self.entries(filename))
+
+    def sample(self, filename: str, n: int = 10, seed: Optional[int] = None) -> list[LogEntry]:
+        """n matching entries chosen uniformly at random in one pass (reservoir sampling)."""
+        return reservoir_sample(self.entries(filename), n, seed)
+
+    def group_by(self, filename: str, *fields: str) -> Counter:
+        """Count matches per value of one field, or per tuple of several."""
+        if not fields:
+            raise ValueError("Group by needs at least one field.")
+        names = []
+        for name in fields:
+            if name.lower() not in FIELDS:
+                raise ValueError(f"Unknown field {name!r}.")
+            names.append(FIELDS[name.lower()])
+        counts: Counter = Counter()
+        if len(names) == 1:
+            name = names[0]
+            for entry in self.entries(filename):
+                counts[getattr(entry, name)] += 1
+        else:
+            for entry in self.entries(filename):
+                counts[tuple(getattr(entry, name) for name in names)] += 1
+        return counts
+
+    def __repr__(self) -> str:
+        return f"Query({self.text!r})"
+
+
+# ─────────────────────────────────────────────
+#  Comparison functions
+# ─────────────────────────────────────────────
+@timer
+@memory_tracker
+def approach_lambda_chain(filename: str) -> int:
+    """Checks every parsed entry against a list of lambdas, in the order they were written."""
+    checks = [
+        lambda e: re.search("timeout", e.message) is not None,
+        lambda e: e.tag in ("ActivityManager", "PowerManagerService"),
+        lambda e: LogEntry.LEVELS.get(e.level, -1) >= LogEntry.LEVELS["W"],
+    ]
+    return sum(1 for entry in log_reader(filename) if all(check(entry) for check in checks))
+
+
+@timer
+@memory_tracker
+def approach_compiled_query(filename: str) -> int:
+    """One compiled predicate: set lookups first, substring test last, filters pushed down."""
+    query = Query('msg~"timeout" and tag in (ActivityManager, PowerManagerService) and level>=W')
+    return query.count(filename)
+
+
+# ─────────────────────────────────────────────
+#  Run comparison
+# ─────────────────────────────────────────────
+FILE = "./datasets/Android.log"
+
+if __name__ == "__main__":
+    print("=" * 50)
+    print("  LAMBDA CHAIN  (regex, tag, level per entry)")
+    print("=" * 50)
+    count = approach_lambda_chain(FILE)
+    print(f"  Entries matched   : {count}\n")
+
+    print("=" * 50)
+    print("  COMPILED QUERY  (reordered, pushed down)")
+    print("=" * 50)
+    count = approach_compiled_query(FILE)
+    print(f"  Entries matched   : {count}\n")
+
+    query = Query("level>=W")
+    print(f"  {query.source}")
+    for tag, seen in query.group_by(FILE, "tag").most_common(5):
+        print(f"  {tag:<28} {seen}")
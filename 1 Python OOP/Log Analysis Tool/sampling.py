@@ -0,0 +1,286 @@
+import math
+import os
+import random
+from collections import Counter
+from dataclasses import dataclass, field
+from itertools import islice
+from typing import Optional
+
+from init import LogEntry, timer, memory_tracker, log_reader, line_filter
+from aggregate import key_getter
+from compressed import detect_codec, open_log
+
+# the shortest line LogEntry.parse accepts: one-digit fraction, pid and tid, a one-letter tag, no message
+MIN_LINE = len(b"03-17 00:00:00.0 1 2 I T:\n")
+SEEK_BLOCK = 4096
+MAX_DRAWS = 64                  # seek attempts allowed per requested entry before giving up
+
+
+def _check_size(n) -> None:
+    if not isinstance(n, int) or isinstance(n, bool):
+        raise TypeError("Sample size must be an integer.")
+    if n < 0:
+        raise ValueError("Sample size must not be negative.")
+
+
+# ─────────────────────────────────────────────
+#  Reservoir sampling
+# ─────────────────────────────────────────────
+def _gap(rng: random.Random, weight: float) -> int:
+    # 1 - random() lies in (0, 1], so the logarithm is always defined
+    return int(math.log(1.0 - rng.random()) / math.log1p(-weight))
+
+
+def _shrink(rng: random.Random, n: int) -> float:
+    return math.exp(math.log(1.0 - rng.random()) / n)
+
+
+def reservoir_sample(items, n: int, seed: Optional[int] = None) -> list:
+    """n items chosen uniformly at random in one pass, in arbitrary order.
+
+    Uses Li's Algorithm L: rather than drawing a random number for every
+    item, it draws how many items to skip before the next replacement, and
+    islice skips them without touching Python code. After the reservoir
+    fills, random draws grow only with n·log(N/n), not with N.
+    """
+    _check_size(n)
+    rng = random.Random(seed)
+    iterator = iter(items)
+    reservoir = list(islice(iterator, n))
+    if len(reservoir) < n or n == 0:
+        return reservoir
+    weight = _shrink(rng, n)
+    missing = object()
+    while True:
+        item = next(islice(iterator, _gap(rng, weight), None), missing)
+        if item is missing:
+            return reservoir
+        reservoir[rng.randrange(n)] = item
+        weight *= _shrink(rng, n)
+
+
+class Reservoir:
+    """Algorithm L one item at a time, for callers that must route each item themselves."""
+
+    def __init__(self, n: int, rng: random.Random):
+        _check_size(n)
+        self.n = n
+        self.items: list = []
+        self.seen = 0
+        self._rng = rng
+        self._weight = _shrink(rng, n) if n else 0.0
+        self._skip = _gap(rng, self._weight) if n else 0
+
+    def offer(self, item) -> None:
+        self.seen += 1
+        if len(self.items) < self.n:
+            self.items.append(item)
+        elif self._skip:
+            self._skip -= 1
+        elif self.n:
+            self.items[self._rng.randrange(self.n)] = item
+            self._weight *= _shrink(self._rng, self.n)
+            self._skip = _gap(self._rng, self._weight)
+
+
+def sample(filename: str, n: int = 100, seed: Optional[int] = None, **filters) -> list[LogEntry]:
+    """min(n, matching entries) entries chosen uniformly from the log, returned in log order.
+
+    Only lines that parse are offered to the reservoir, so continuation
+    lines and stack traces never take a place. The check is the entry
+    pattern's match, which runs in C and builds no objects; only the
+    chosen lines are turned into LogEntry objects.
+    """
+    if not isinstance(filename, str):
+        raise TypeError("File name must be str.")
+    _check_size(n)
+    accept = line_filter(**filters)
+    with open_log(filename) as file:
+        lines = map(str.strip, file)
+        if accept is not None:
+            lines = filter(accept, lines)
+        # parse() accepts exactly the lines _PATTERN matches, whichever parser is selected
+        chosen = reservoir_sample(enumerate(filter(LogEntry._PATTERN.match, lines)), n, seed)
+    return [LogEntry.parse(line) for _, line in sorted(chosen, key=lambda item: item[0])]
+
+
+# ─────────────────────────────────────────────
+#  Stratified sampling
+# ─────────────────────────────────────────────
+@dataclass
+class StratifiedSample:
+    """Up to n entries per stratum, with how many entries each stratum had in total."""
+    by: object
+    samples: dict = field(default_factory=dict)
+    counts: Counter = field(default_factory=Counter)
+
+    def weight(self, stratum) -> float:
+        """Entries each sampled entry of `stratum` stands for — for scaling estimates back up."""
+        return self.counts[stratum] / len(self.samples[stratum])
+
+    def entries(self) -> list[LogEntry]:
+        return [entry for stratum in self.samples.values() for entry in stratum]
+
+    def __repr__(self) -> str:
+        return f"StratifiedSample(by={self.by!r}, strata={len(self.samples)}, entries={sum(self.counts.values())})"
+
+
+def stratified_sample(filename: str, n: int = 10, by="level", seed: Optional[int] = None,
+                      **filters) -> StratifiedSample:
+    """n entries per value of `by` in one pass, so rare levels or tags are not drowned out.
+
+    `by` is any aggregate.key_getter key: "level", "tag", a tuple of fields
+    or "shape". Each stratum keeps its own reservoir; counts record how
+    many entries it had, so per-stratum results can be weighted back up.
+    """
+    _check_size(n)
+    get = key_getter(by)
+    rng = random.Random(seed)
+    reservoirs: dict = {}
+    for entry in log_reader(filename, **filters):
+        stratum = get(entry)
+        reservoir = reservoirs.get(stratum)
+        if reservoir is None:
+            reservoir = reservoirs[stratum] = Reservoir(n, rng)
+        reservoir.offer(entry)
+    result = StratifiedSample(by)
+    for stratum in sorted(reservoirs, key=lambda value: reservoirs[value].seen, reverse=True):
+        result.samples[stratum] = reservoirs[stratum].items
+        result.counts[stratum] = reservoirs[stratum].seen
+    return result
+
+
+# ─────────────────────────────────────────────
+#  Random-seek sampling
+# ─────────────────────────────────────────────
+@dataclass
+class SeekSample:
+    """Entries from random byte offsets plus what it took to find them."""
+    entries: list
+    draws: int
+    size: int
+
+    @property
+    def estimated_entries(self) -> int:
+        """Matching entries in the whole file, from the acceptance rate of the draws.
+
+        Each draw accepts a given entry with probability MIN_LINE / size, so
+        accepted / draws · size / MIN_LINE is unbiased. The relative error
+        is about 1/sqrt(accepted).
+        """
+        if not self.draws:
+            return 0
+        return round(len(self.entries) / self.draws * self.size / MIN_LINE)
+
+    def __repr__(self) -> str:
+        return f"SeekSample(entries={len(self.entries)}, draws={self.draws}, estimated={self.estimated_entries})"
+
+
+def _line_at(file, offset: int) -> tuple[int, bytes]:
+    """(start, bytes) of the line containing byte `offset`, newline included."""
+    start = offset
+    while start > 0:
+        step = min(SEEK_BLOCK, start)
+        file.seek(start - step)
+        cut = file.read(step).rfind(b"\n")
+        if cut >= 0:
+            start = start - step + cut + 1
+            break
+        start -= step
+    file.seek(start)
+    return start, file.readline()
+
+
+def seek_sample(filename: str, n: int = 100, seed: Optional[int] = None, **filters) -> SeekSample:
+    """About n entries from random byte offsets — reads a few KB per entry, whatever the file size.
+
+    A random offset lands in a line with probability proportional to its
+    length, so the line is kept with probability MIN_LINE / its length;
+    no parseable line is shorter than MIN_LINE, so that is a true
+    probability, every entry has the same chance per draw and the sample is
+    uniform (with replacement). Lines that fail to parse or to pass the
+    filters are drawn again, up to MAX_DRAWS draws per wanted entry.
+    Needs an uncompressed log, since compressed streams cannot seek.
+    """
+    if not isinstance(filename, str):
+        raise TypeError("File name must be str.")
+    _check_size(n)
+    if detect_codec(filename) is not None:
+        raise ValueError("Seek sampling needs an uncompressed log.")
+    accept = line_filter(**filters)
+    rng = random.Random(seed)
+    size = os.path.getsize(filename)
+    found: list[tuple[int, LogEntry]] = []
+    draws = 0
+    with open(filename, "rb") as file:
+        while size and len(found) < n and draws < n * MAX_DRAWS:
+            draws += 1
+            start, data = _line_at(file, rng.randrange(size))
+            if rng.random() * len(data) >= MIN_LINE:
+                continue
+            line = data.decode("utf-8", errors="replace").strip()
+            if accept is not None and not accept(line):
+                continue
+            entry = LogEntry.parse(line)
+            if entry:
+                found.append((start, entry))
+    found.sort(key=lambda item: item[0])
+    return SeekSample([entry for _, entry in found], draws, size)
+
+
+# ─────────────────────────────────────────────
+#  Comparison functions
+# ─────────────────────────────────────────────
+@timer
+@memory_tracker
+def approach_list_then_sample(filename: str, n: int) -> int:
+    """Loads every entry into a list, then picks n — full file in RAM."""
+    entries = list(log_reader(filename))
+    return len(random.sample(entries, min(n, len(entries))))
+
+
+@timer
+@memory_tracker
+def approach_reservoir(filename: str, n: int) -> int:
+    """One pass over raw lines; only the n chosen lines are parsed."""
+    return len(sample(filename, n))
+
+
+@timer
+@memory_tracker
+def approach_seek(filename: str, n: int) -> SeekSample:
+    """Random byte offsets; reads a few KB per entry instead of the file."""
+    return seek_sample(filename, n)
+
+
+# ─────────────────────────────────────────────
+#  Run comparison
+# ─────────────────────────────────────────────
+FILE = "./datasets/Android.log"
+
+if __name__ == "__main__":
+    print("=" * 50)
+    print("  LIST THEN SAMPLE  (all entries in RAM)")
+    print("=" * 50)
+    count = approach_list_then_sample(FILE, 1000)
+    print(f"  Entries sampled   : {count}\n")
+
+    print("=" * 50)
+    print("  RESERVOIR  (Algorithm L, parse chosen lines only)")
+    print("=" * 50)
+    count = approach_reservoir(FILE, 1000)
+    print(f"  Entries sampled   : {count}\n")
+
+    print("=" * 50)
+    print("  RANDOM SEEK  (byte offsets, no full pass)")
+    print("=" * 50)
+    result = approach_seek(FILE, 1000)
+    print(f"  Entries sampled   : {len(result.entries)}")
+    print(f"  Estimated entries : {result.estimated_entries}\n")
+
+    print("=" * 50)
+    print("  STRATIFIED BY LEVEL  (5 per level)")
+    print("=" * 50)
+    strata = stratified_sample(FILE, 5, by="level")
+    for level, entries in strata.samples.items():
+        print(f"  {level} : {strata.counts[level]:>9} entries, {len(entries)} sampled")
@@ -0,0 +1,339 @@
+import json
+import os
+import re
+import shutil
+import struct
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+from init import LogEntry, timer, memory_tracker, log_reader
+from compressed import detect_codec
+from parallel import CHUNKS_PER_WORKER, chunk_ranges
+from time_index import head_digest
+
+SUFFIX = ".search"
+MAGIC = b"LOGSRCH1"
+SEGMENT_BYTES = 64 * 1024 * 1024
+
+_TOKEN = re.compile(r"\w+")
+_SEGMENT_HEADER = struct.Struct("<8sQ")     # magic, length of the JSON term dictionary
+
+
+def tokenize(text: str) -> list[str]:
+    return _TOKEN.findall(text.lower())
+
+
+# ─────────────────────────────────────────────
+#  Varint postings
+# ─────────────────────────────────────────────
+def encode_postings(offsets: list[int]) -> bytes:
+    """Delta-encode ascending offsets as LEB128 varints."""
+    out = bytearray()
+    previous = 0
+    for offset in offsets:
+        delta = offset - previous
+        previous = offset
+        while delta >= 0x80:
+            out.append((delta & 0x7F) | 0x80)
+            delta >>= 7
+        out.append(delta)
+    return bytes(out)
+
+
+def decode_postings(data: bytes) -> list[int]:
+    offsets = []
+    value = shift = previous = 0
+    for byte in data:
+        value |= (byte & 0x7F) << shift
+        if byte & 0x80:
+            shift += 7
+            continue
+        previous += value
+        offsets.append(previous)
+        value = shift = 0
+    return offsets
+
+
+# ─────────────────────────────────────────────
+#  Segments
+# ─────────────────────────────────────────────
+def build_segment(filename: str, start: int, end: int, path: str) -> str:
+    """Index the lines in [start, end) of the log into one segment file."""
+    postings: dict[str, list[int]] = {}
+    with open(filename, "rb") as file:
+        file.seek(start)
+        offset = start
+        for raw_line in file:
+            if offset >= end:
+                break
+            entry = LogEntry.parse(raw_line.decode("utf-8", errors="replace").strip())
+            if entry:
+                for token in set(tokenize(entry.message)):
+                    postings.setdefault(token, []).append(offset)
+            offset += len(raw_line)
+
+    terms = {}
+    blob = bytearray()
+    for token, offsets in postings.items():
+        encoded = encode_postings(offsets)
+        terms[token] = [len(blob), len(encoded), len(offsets)]
+        blob += encoded
+    dictionary = json.dumps(terms, separators=(",", ":")).encode("utf-8")
+    with open(path, "wb") as file:
+        file.write(_SEGMENT_HEADER.pack(MAGIC, len(dictionary)))
+        file.write(dictionary)
+        file.write(blob)
+    return path
+
+
+class Segment:
+    """One immutable piece of the index: a term dictionary plus varint postings read on demand."""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as file:
+            magic, length = _SEGMENT_HEADER.unpack(file.read(_SEGMENT_HEADER.size))
+            if magic != MAGIC:
+                raise ValueError(f"Not a search segment: {path}")
+            self.terms: dict = json.loads(file.read(length))
+        self.base = _SEGMENT_HEADER.size + length
+
+    def postings(self, token: str) -> list[int]:
+        found = self.terms.get(token)
+        if found is None:
+            return []
+        start, length, _ = found
+        with open(self.path, "rb") as file:
+            file.seek(self.base + start)
+            return decode_postings(file.read(length))
+
+
+# ─────────────────────────────────────────────
+#  SearchIndex
+# ─────────────────────────────────────────────
+class SearchIndex:
+    """On-disk inverted index from message tokens to the byte offsets of their lines.
+
+    The index is a directory of segments next to the log, each covering a
+    contiguous byte range, plus a manifest with the source size, mtime and
+    head digest. Segments are built in parallel; when the log only grew,
+    a refresh just adds segments for the new bytes.
+    """
+
+    ####################### Initialization #######################
+
+    def __init__(self, filename: str):
+        if not isinstance(filename, str):
+            raise TypeError("File name must be str.")
+        if not filename.strip():
+            raise ValueError("File name must not be empty.")
+        self.filename = filename
+        self.path = filename + SUFFIX
+        self.size = 0
+        self.mtime_ns = 0
+        self.indexed = 0
+        self.digest = ""
+        self.segments: list[Segment] = []
+
+    @classmethod
+    def open(cls, filename: str, workers: Optional[int] = None) -> "SearchIndex":
+        """Load the index and bring it up to date; postings are byte offsets, so the log must be uncompressed."""
+        index = cls(filename)
+        if detect_codec(filename) is not None:
+            raise ValueError("Search index needs an uncompressed log.")
+        index.load()
+        index.refresh(workers)
+        return index
+
+    ####################### Persistence #######################
+
+    @property
+    def manifest(self) -> str:
+        return os.path.join(self.path, "manifest.json")
+
+    def load(self) -> None:
+        try:
+            with open(self.manifest, "r", encoding="utf-8") as file:
+                data = json.load(file)
+            segments = [Segment(os.path.join(self.path, name)) for name in data["segments"]]
+        except (FileNotFoundError, KeyError, ValueError):
+            return
+        self.size, self.mtime_ns = data["size"], data["mtime_ns"]
+        self.indexed, self.digest = data["indexed"], data["digest"]
+        self.segments = segments
+
+    def save(self) -> None:
+        data = {
+            "size": self.size, "mtime_ns": self.mtime_ns,
+            "indexed": self.indexed, "digest": self.digest,
+            "segments": [os.path.basename(segment.path) for segment in self.segments],
+        }
+        temporary = self.manifest + ".tmp"
+        with open(temporary, "w", encoding="utf-8") as file:
+            json.dump(data, file)
+        os.replace(temporary, self.manifest)
+
+    ####################### Building #######################
+
+    def refresh(self, workers: Optional[int] = None) -> bool:
+        """Index whatever the segments do not cover yet; rebuild if the log was rewritten."""
+        stat = os.stat(self.filename)
+        if stat.st_size == self.size and stat.st_mtime_ns == self.mtime_ns:
+            return False
+        grown = (self.segments and stat.st_size >= self.size
+                 and head_digest(self.filename, self.size).hex() == self.digest)
+        if not grown:
+            shutil.rmtree(self.path, ignore_errors=True)
+            self.segments, self.indexed = [], 0
+        os.makedirs(self.path, exist_ok=True)
+
+        end = self._last_newline(stat.st_size)
+        if end > self.indexed:
+            self._build(self.indexed, end, workers)
+            self.indexed = end
+        self.size, self.mtime_ns = stat.st_size, stat.st_mtime_ns
+        self.digest = head_digest(self.filename, self.size).hex()
+        self.save()
+        return True
+
+    def _last_newline(self, size: int) -> int:
+        """Only index complete lines — a half-written last line waits for the next refresh."""
+        with open(self.filename, "rb") as file:
+            position = size
+            while position > self.indexed:
+                step = min(64 * 1024, position - self.indexed)
+                file.seek(position - step)
+                found = file.read(step).rfind(b"\n")
+                if found >= 0:
+                    return position - step + found + 1
+                position -= step
+        return self.indexed
+
+    def _build(self, start: int, end: int, workers: Optional[int]) -> None:
+        workers = workers or os.cpu_count() or 1
+        span = end - start
+        pieces = max(workers * CHUNKS_PER_WORKER, -(-span // SEGMENT_BYTES))
+        ranges = chunk_ranges(self.filename, pieces, start, end)
+        first = len(self.segments)
+        paths = [os.path.join(self.path, f"segment-{first + number:06d}.bin")
+                 for number in range(len(ranges))]
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(build_segment, self.filename, low, high, path)
+                       for (low, high), path in zip(ranges, paths)]
+            self.segments += [Segment(future.result()) for future in futures]
+
+    ####################### Queries #######################
+
+    def postings(self, token: str) -> list[int]:
+        offsets: list[int] = []
+        for segment in self.segments:       # segments cover ascending byte ranges
+            offsets += segment.postings(token.lower())
+        return offsets
+
+    def all_of(self, tokens) -> list[int]:
+        result: Optional[set] = None
+        for token in sorted(set(tokens), key=self._frequency):
+            found = set(self.postings(token))
+            result = found if result is None else result & found
+            if not result:
+                return []
+        return sorted(result or ())
+
+    def any_of(self, tokens) -> list[int]:
+        result: set = set()
+        for token in set(tokens):
+            result.update(self.postings(token))
+        return sorted(result)
+
+    def phrase(self, text: str) -> list[int]:
+        """Lines whose message holds the tokens of text next to each other."""
+        run = tokenize(text)
+        return self._with_phrases(self.all_of(run), [run]) if run else []
+
+    def query(self, text: str) -> list[int]:
+        """`a b "c d" OR e` — terms and quoted phrases are ANDed, OR separates alternatives."""
+        matches: set = set()
+        for clause in re.split(r"\s+OR\s+", text.strip()):
+            runs = [tokenize(phrase) for phrase in re.findall(r'"([^"]*)"', clause)]
+            runs = [run for run in runs if run]
+            terms = tokenize(re.sub(r'"[^"]*"', " ", clause))
+            candidates = self.all_of(terms + [token for run in runs for token in run])
+            matches.update(self._with_phrases(candidates, runs))
+        return sorted(matches)
+
+    def search(self, text: str):
+        """Run a query and yield the matching LogEntry objects in file order."""
+        with open(self.filename, "rb") as file:
+            for offset in self.query(text):
+                entry = _read_entry(file, offset)
+                if entry:
+                    yield entry
+
+    def _with_phrases(self, offsets: list[int], runs: list[list[str]]) -> list[int]:
+        if not runs:
+            return offsets
+        kept = []
+        with open(self.filename, "rb") as file:
+            for offset in offsets:
+                entry = _read_entry(file, offset)
+                tokens = tokenize(entry.message) if entry else []
+                if all(_contains_run(tokens, run) for run in runs):
+                    kept.append(offset)
+        return kept
+
+    def _frequency(self, token: str) -> int:
+        return sum(segment.terms.get(token, (0, 0, 0))[2] for segment in self.segments)
+
+    def __repr__(self) -> str:
+        return f"SearchIndex(filename={self.filename!r}, segments={len(self.segments)}, indexed={self.indexed})"
+
+
+def _read_entry(file, offset: int) -> Optional[LogEntry]:
+    file.seek(offset)
+    return LogEntry.parse(file.readline().decode("utf-8", errors="replace").strip())
+
+
+def _contains_run(tokens: list[str], run: list[str]) -> bool:
+    width = len(run)
+    return any(tokens[i:i + width] == run for i in range(len(tokens) - width + 1))
+
+
+# ─────────────────────────────────────────────
+#  Comparison functions
+# ─────────────────────────────────────────────
+@timer
+@memory_tracker
+def approach_regex_scan(filename: str, word: str) -> int:
+    """Reads every entry and regex-searches its message."""
+    pattern = re.compile(rf"\b{re.escape(word)}\b", re.IGNORECASE)
+    return sum(1 for entry in log_reader(filename) if pattern.search(entry.message))
+
+
+@timer
+@memory_tracker
+def approach_indexed_search(index: SearchIndex, word: str) -> int:
+    """Looks the word up in the inverted index and seeks to each hit."""
+    return sum(1 for _ in index.search(word))
+
+
+# ─────────────────────────────────────────────
+#  Run comparison
+# ─────────────────────────────────────────────
+FILE = "./datasets/Android.log"
+
+if __name__ == "__main__":
+    index = SearchIndex.open(FILE)
+    print(f"  {index}\n")
+    word = "timeout"
+
+    print("=" * 50)
+    print(f"  REGEX SCAN  ({word!r})")
+    print("=" * 50)
+    count = approach_regex_scan(FILE, word)
+    print(f"  Entries matched   : {count}\n")
+
+    print("=" * 50)
+    print(f"  INVERTED INDEX  ({word!r})")
+    print("=" * 50)
+    count = approach_indexed_search(index, word)
+    print(f"  Entries matched   : {count}\n")
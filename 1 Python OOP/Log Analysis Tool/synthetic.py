@@ -0,0 +1,351 @@
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field, asdict
+from datetime import date, timedelta
+from typing import Optional
+
+from init import log_reader
+from templates import WILDCARD, TemplateMiner
+
+SHARD_BYTES = 64 * 1024 * 1024
+BATCH_LINES = 20_000
+STAMP_BYTES = 18                # 'MM-DD HH:MM:SS.mmm'
+MAX_COMBOS = 5_000
+MAX_THREADS = 2_000
+MAX_SAMPLES = 20
+CALENDAR_YEAR = 2000            # a leap year, so a sample starting on 02-29 still works
+
+_UNITS = {"": 1, "K": 1024, "M": 1024 ** 2, "G": 1024 ** 3}
+
+
+def parse_size(text: str) -> int:
+    """'512M', '10G', '2048' → bytes."""
+    text = text.strip().upper().rstrip("B")
+    unit = text[-1:] if text[-1:] in _UNITS else ""
+    number = float(text[:-1] if unit else text)
+    if number <= 0:
+        raise ValueError("Size must be positive.")
+    return int(number * _UNITS[unit])
+
+
+# ─────────────────────────────────────────────
+#  Profile
+# ─────────────────────────────────────────────
+@dataclass
+class Profile:
+    """What a generated log should look like, learned from a sample.
+
+    combos are joint (tag, level, template, count) rows, so tags keep
+    their usual levels and messages; threads are (pid, tid, count) rows;
+    params keeps a few sample values for each <*> slot of a template.
+    """
+    combos: list = field(default_factory=list)
+    threads: list = field(default_factory=list)
+    params: dict = field(default_factory=dict)
+    mean_gap_ms: float = 5.0
+    start: str = "03-17 16:13:38.811"
+
+    @classmethod
+    def learn(cls, filename: str, max_lines: Optional[int] = None) -> "Profile":
+        miner = TemplateMiner()
+        combos: Counter = Counter()
+        threads: Counter = Counter()
+        samples: dict[int, list[list[str]]] = {}
+        first = last = None
+        count = 0
+        for entry in log_reader(filename):
+            template_id, _ = miner.add(entry.message)
+            combos[(entry.tag, entry.level, template_id)] += 1
+            threads[(entry.pid, entry.tid)] += 1
+            kept = samples.setdefault(template_id, [])
+            if len(kept) < MAX_SAMPLES:
+                kept.append(entry.message.split())
+            stamp = f"{entry.date} {entry.time}"
+            first = first or stamp
+            last = stamp
+            count += 1
+            if max_lines is not None and count >= max_lines:
+                break
+        if not count:
+            raise ValueError(f"No log entries found in {filename}.")
+
+        profile = cls(start=first)
+        span = _stamp_ms(last) - _stamp_ms(first)
+        profile.mean_gap_ms = max(span / max(count - 1, 1), 0.01)
+        for (tag, level, template_id), seen in combos.most_common(MAX_COMBOS):
+            template = miner.templates[template_id]
+            text = str(template)
+            profile.combos.append([tag, level, text, seen])
+            if WILDCARD in template.tokens and text not in profile.params:
+                slots = [template.parameters(tokens) for tokens in samples[template_id]
+                         if len(tokens) == len(template.tokens)]
+                profile.params[text] = [list(values) for values in zip(*slots)]
+        profile.threads = [[pid, tid, seen] for (pid, tid), seen in threads.most_common(MAX_THREADS)]
+        return profile
+
+    @classmethod
+    def default(cls) -> "Profile":
+        """A tiny built-in profile for when there is no sample log to learn from."""
+        return cls(
+            combos=[
+                ["ActivityManager", "I", "Start proc <*> for activity <*>", 40],
+                ["PowerManagerService", "D", "acquire lock=<*> flags=0x1 tag=\"RILJ\"", 120],
+                ["PowerManagerService", "D", "release:lock=<*> flg=0x0", 120],
+                ["WindowManager", "V", "Skipping <*> -- going to hide", 60],
+                ["DisplayPowerController", "W", "Screen on blocked for <*> ms", 8],
+                ["ActivityManager", "E", "ANR in <*> Reason: <*>", 2],
+            ],
+            threads=[[1702, 2395, 50], [1702, 8671, 30], [2227, 2227, 15], [3376, 3376, 5]],
+            params={
+                "Start proc <*> for activity <*>": [["2731:com.android.phone/1001"],
+                                                    ["com.android.phone/.Settings"]],
+                "acquire lock=<*> flags=0x1 tag=\"RILJ\"": [["166121161"]],
+                "release:lock=<*> flg=0x0": [["166121161,"]],
+                "Skipping <*> -- going to hide": [["AppWindowToken{df0798e"]],
+                "Screen on blocked for <*> ms": [["172"]],
+                "ANR in <*> Reason: <*>": [["com.android.systemui"], ["Input"]],
+            },
+        )
+
+    def save(self, path: str) -> None:
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(asdict(self), file)
+
+    @classmethod
+    def load(cls, path: str) -> "Profile":
+        with open(path, "r", encoding="utf-8") as file:
+            return cls(**json.load(file))
+
+
+# ─────────────────────────────────────────────
+#  Timestamps
+# ─────────────────────────────────────────────
+def _stamp_ms(stamp: str) -> int:
+    day, clock = stamp.split()
+    month, day_of_month = int(day[0:2]), int(day[3:5])
+    hours, minutes, seconds = clock.split(":")
+    days = (date(CALENDAR_YEAR, month, day_of_month) - date(CALENDAR_YEAR, 1, 1)).days
+    return ((days * 24 + int(hours)) * 60 + int(minutes)) * 60_000 + round(float(seconds) * 1000)
+
+
+class _Clock:
+    """Formats millisecond offsets as 'MM-DD HH:MM:SS.mmm', caching the date part per day."""
+
+    def __init__(self):
+        self._day = -1
+        self._date = ""
+
+    def format(self, ms: int) -> str:
+        day, rest = divmod(ms, 86_400_000)
+        if day != self._day:
+            self._day = day
+            self._date = (date(CALENDAR_YEAR, 1, 1) + timedelta(days=day % 366)).strftime("%m-%d")
+        seconds, millis = divmod(rest, 1000)
+        minutes, seconds = divmod(seconds, 60)
+        hours, minutes = divmod(minutes, 60)
+        return f"{self._date} {hours:02d}:{minutes:02d}:{seconds:02d}.{millis:03d}"
+
+
+# ─────────────────────────────────────────────
+#  Writing
+# ─────────────────────────────────────────────
+def _compile(profile: dict) -> tuple[list, list]:
+    """Pre-render the constant parts of every combo and thread once per shard."""
+    combos = []
+    for tag, level, text, _ in profile["combos"]:
+        slots = profile["params"].get(text) or []
+        pieces = text.split(WILDCARD)
+        slots = [slots[number] if number < len(slots) and slots[number] else ["0"]
+                 for number in range(len(pieces) - 1)]
+        combos.append((f" {level} {tag}: {pieces[0]}", pieces[1:], slots))
+    threads = [f" {pid:>5} {tid:>5}" for pid, tid, _ in profile["threads"]]
+    return combos, threads
+
+
+def _fill(rng: random.Random, pieces: list[str], slots: list[list[str]]) -> str:
+    out = []
+    for piece, values in zip(pieces, slots):
+        value = rng.choice(values)
+        if value.isdigit():             # vary numbers but keep their width
+            value = str(rng.randrange(10 ** (len(value) - 1), 10 ** len(value)))
+        out.append(value)
+        out.append(piece)
+    return "".join(out)
+
+
+def _render(rng: random.Random, combos: list, threads: list, combo_weights: list,
+            thread_weights: list, count: int) -> list[str]:
+    """`count` lines without their timestamps: pid, tid, level, tag and filled message."""
+    picks = rng.choices(combos, cum_weights=combo_weights, k=count)
+    owners = rng.choices(threads, cum_weights=thread_weights, k=count)
+    return [f"{owner}{head}{_fill(rng, pieces, slots) if pieces else ''}\n"
+            for (head, pieces, slots), owner in zip(picks, owners)]
+
+
+def _size(text: str) -> int:
+    return len(text) if text.isascii() else len(text.encode("utf-8"))
+
+
+def _write_shard(profile: dict, path: str, offset: int, budget: int, seed: int,
+                 start_ms: int, window_ms: int) -> int:
+    """Fill exactly `budget` bytes of `path` from `offset`, timestamps spread over [start_ms, start_ms + window_ms).
+
+    Each batch gets the slice of the window its bytes are of the budget,
+    with exponential gaps scaled to fill that slice, so timestamps follow
+    the lines actually written and never run past the window. The bytes
+    no whole line fits in are spaces before the last newline, which the
+    parser strips from the message.
+    """
+    rng = random.Random(seed)
+    combos, threads = _compile(profile)
+    combo_weights = list(_cumulative(row[3] for row in profile["combos"]))
+    thread_weights = list(_cumulative(row[2] for row in profile["threads"]))
+    clock = _Clock()
+    now = float(start_ms)
+    end_ms = start_ms + window_ms - 1
+    stamp_ms, stamp = -1, ""
+    written = lines = 0
+    with open(path, "r+b", buffering=8 * 1024 * 1024) as file:
+        file.seek(offset)
+        while written < budget:
+            bodies = _render(rng, combos, threads, combo_weights, thread_weights, BATCH_LINES)
+            size = _size("".join(bodies)) + STAMP_BYTES * len(bodies)
+            if written + size > budget:
+                # last batch: keep only the lines that fit
+                kept = 0
+                size = 0
+                for body in bodies:
+                    line_size = _size(body) + STAMP_BYTES
+                    if written + size + line_size > budget:
+                        break
+                    size += line_size
+                    kept += 1
+                bodies = bodies[:kept]
+                if not bodies:
+                    break
+            gaps = [rng.expovariate(1.0) for _ in bodies]
+            scale = (window_ms - 1) * size / budget / sum(gaps)
+            batch = []
+            for body, gap in zip(bodies, gaps):
+                now += gap * scale
+                if int(now) != stamp_ms:
+                    stamp_ms = min(int(now), end_ms)    # guards float rounding only
+                    stamp = clock.format(stamp_ms)
+                batch.append(stamp + body)
+            file.write("".join(batch).encode("utf-8"))
+            written += size
+            lines += len(batch)
+        if written < budget:
+            if lines:
+                file.seek(offset + written - 1)     # back over the last newline
+                file.write(b" " * (budget - written) + b"\n")
+            else:
+                file.write(b" " * (budget - 1) + b"\n")
+    return lines
+
+
+def _average_line(profile: Profile, sample: int = 5000) -> float:
+    """Bytes per line of a rendered sample, used to size each shard's time window."""
+    combos, threads = _compile(asdict(profile))
+    bodies = _render(random.Random(0), combos, threads,
+                     list(_cumulative(row[3] for row in profile.combos)),
+                     list(_cumulative(row[2] for row in profile.threads)), sample)
+    return _size("".join(bodies)) / sample + STAMP_BYTES
+
+
+def _cumulative(weights):
+    total = 0
+    for weight in weights:
+        total += weight
+        yield total
+
+
+def generate(target: str, size: int, profile: Optional[Profile] = None,
+             seed: int = 0, workers: Optional[int] = None) -> int:
+    """Write exactly `size` bytes of Android-format log; return the number of lines.
+
+    The output is cut into fixed SHARD_BYTES shards, each with its own
+    seed and time window, and written by a process pool straight into its
+    place in one temporary file next to the target, which then replaces
+    the target. No byte is written twice, so the disk only needs room for
+    the output itself. The same seed and size always give the same file,
+    however many workers are used.
+    """
+    if not isinstance(size, int) or isinstance(size, bool):
+        raise TypeError("Size must be an integer.")
+    if size <= 0:
+        raise ValueError("Size must be positive.")
+    profile = profile or Profile.default()
+    if not profile.combos or not profile.threads:
+        raise ValueError("Profile has nothing to generate from.")
+    workers = workers or os.cpu_count() or 1
+    shards = -(-size // SHARD_BYTES)
+    window_ms = max(1, int(min(size, SHARD_BYTES) / _average_line(profile) * profile.mean_gap_ms))
+    start_ms = _stamp_ms(profile.start)
+    data = asdict(profile)
+    temporary = target + ".tmp"
+    try:
+        with open(temporary, "wb") as file:
+            file.truncate(size)
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [
+                pool.submit(_write_shard, data, temporary, number * SHARD_BYTES,
+                            min(SHARD_BYTES, size - number * SHARD_BYTES),
+                            seed * 1_000_003 + number,
+                            start_ms + number * window_ms, window_ms)
+                for number in range(shards)
+            ]
+            lines = sum(future.result() for future in futures)
+        os.replace(temporary, target)
+    except BaseException:
+        if os.path.exists(temporary):
+            os.remove(temporary)
+        raise
+    return lines
+
+
+# ─────────────────────────────────────────────
+#  Run generator
+# ─────────────────────────────────────────────
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Generate a synthetic Android-format log.")
+    parser.add_argument("output")
+    parser.add_argument("--size", default="100M", help="target size, e.g. 512M or 10G")
+    parser.add_argument("--sample", help="learn distributions and templates from this log")
+    parser.add_argument("--sample-lines", type=int, help="only learn from the first N entries")
+    parser.add_argument("--profile", help="load a saved profile instead of learning one")
+    parser.add_argument("--save-profile", help="write the profile used to this JSON file")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int)
+    args = parser.parse_args(argv)
+
+    if args.profile:
+        profile = Profile.load(args.profile)
+    elif args.sample:
+        profile = Profile.learn(args.sample, args.sample_lines)
+    else:
+        profile = Profile.default()
+    if args.save_profile:
+        profile.save(args.save_profile)
+
+    size = parse_size(args.size)
+    print("=" * 50)
+    print(f"  GENERATE  ({size / 1024 / 1024:,.0f} MB, seed {args.seed})")
+    print("=" * 50)
+    start = time.perf_counter()
+    lines = generate(args.output, size, profile, args.seed, args.workers)
+    elapsed = time.perf_counter() - start
+    print(f"  Lines written     : {lines:,}")
+    print(f"  Throughput        : {os.path.getsize(args.output) / elapsed / 1024 / 1024:,.1f} MB/s"
+          f"  ({elapsed:.1f}s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
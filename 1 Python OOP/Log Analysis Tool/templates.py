@@ -0,0 +1,216 @@
+import json
+import time
+from typing import Optional
+
+from init import LogEntry, timer, memory_tracker, log_reader
+
+WILDCARD = "<*>"
+
+
+# ─────────────────────────────────────────────
+#  Template
+# ─────────────────────────────────────────────
+class Template:
+    """One log template: its tokens (with <*> for variable slots) and how many messages it matched."""
+
+    def __init__(self, template_id: int, tokens: list[str], size: int = 1):
+        self.template_id = template_id
+        self.tokens = tokens
+        self.size = size
+
+    def similarity(self, tokens: list[str]) -> tuple[float, int]:
+        """Share of constant positions that equal the message, plus the wildcard count for tie-breaks."""
+        same = wildcards = 0
+        for mine, theirs in zip(self.tokens, tokens):
+            if mine == WILDCARD:
+                wildcards += 1
+            elif mine == theirs:
+                same += 1
+        return same / len(tokens), wildcards
+
+    def absorb(self, tokens: list[str]) -> None:
+        self.tokens = [mine if mine == theirs else WILDCARD
+                       for mine, theirs in zip(self.tokens, tokens)]
+        self.size += 1
+
+    def parameters(self, tokens: list[str]) -> list[str]:
+        return [theirs for mine, theirs in zip(self.tokens, tokens) if mine == WILDCARD]
+
+    def __str__(self) -> str:
+        return " ".join(self.tokens)
+
+    def __repr__(self) -> str:
+        return f"Template(id={self.template_id}, size={self.size}, text={str(self)!r})"
+
+
+# ─────────────────────────────────────────────
+#  Drain miner
+# ─────────────────────────────────────────────
+def _has_digit(token: str) -> bool:
+    return any(char.isdigit() for char in token)
+
+
+class TemplateMiner:
+    """Streaming Drain-style template miner (He et al., 2017).
+
+    Messages are routed through a fixed-depth prefix tree: first by token
+    count, then by their first `depth - 2` tokens (tokens with digits share
+    a <*> branch), down to a leaf holding a short list of templates. Only
+    that list is compared, so the cost per message does not grow with the
+    number of templates mined so far.
+    """
+
+    ####################### Initialization #######################
+
+    def __init__(self, depth: int = 4, threshold: float = 0.4, max_children: int = 100):
+        if not isinstance(depth, int) or isinstance(depth, bool):
+            raise TypeError("Depth must be an integer.")
+        if depth < 3:
+            raise ValueError("Depth must be at least 3.")
+        if not 0 <= threshold <= 1:
+            raise ValueError("Threshold must be between 0 and 1.")
+        if max_children < 1:
+            raise ValueError("Max children must be at least 1.")
+        self.depth = depth
+        self.threshold = threshold
+        self.max_children = max_children
+        self.templates: list[Template] = []
+        self._root: dict = {}
+
+    ####################### Mining #######################
+
+    def _leaf(self, tokens: list[str]) -> list[Template]:
+        node = self._root.setdefault(len(tokens), {})
+        for token in tokens[:self.depth - 2]:
+            key = WILDCARD if _has_digit(token) else token
+            child = node.get(key)
+            if child is None:
+                if len(node) >= self.max_children - 1 and key != WILDCARD:
+                    key = WILDCARD      # too many branches: fold the rest into <*>
+                    child = node.get(key)
+                if child is None:
+                    child = node[key] = {}
+            node = child
+        return node.setdefault(None, [])
+
+    def add(self, message: str) -> tuple[int, list[str]]:
+        """Assign the message to a template (creating one if needed); return its id and parameters."""
+        tokens = message.split()
+        leaf = self._leaf(tokens)
+        best, best_score = None, (-1.0, -1)
+        for template in leaf:
+            score = template.similarity(tokens) if tokens else (1.0, 0)
+            if score > best_score:
+                best, best_score = template, score
+        if best is not None and best_score[0] >= self.threshold:
+            best.absorb(tokens)
+        else:
+            best = Template(len(self.templates), list(tokens))
+            self.templates.append(best)
+            leaf.append(best)
+        return best.template_id, best.parameters(tokens)
+
+    def add_entry(self, entry: LogEntry) -> tuple[int, list[str]]:
+        return self.add(entry.message)
+
+    def match(self, message: str) -> Optional[tuple[int, list[str]]]:
+        """Like add, but read-only: None when no known template is close enough."""
+        tokens = message.split()
+        node = self._root.get(len(tokens))
+        for token in tokens[:self.depth - 2]:
+            if node is None:
+                return None
+            key = WILDCARD if _has_digit(token) else token
+            node = node.get(key, node.get(WILDCARD))
+        if node is None:
+            return None
+        best, best_score = None, (-1.0, -1)
+        for template in node.get(None, []):
+            score = template.similarity(tokens) if tokens else (1.0, 0)
+            if score > best_score:
+                best, best_score = template, score
+        if best is None or best_score[0] < self.threshold:
+            return None
+        return best.template_id, best.parameters(tokens)
+
+    ####################### Persistence #######################
+
+    def to_dict(self) -> dict:
+        return {
+            "depth": self.depth,
+            "threshold": self.threshold,
+            "max_children": self.max_children,
+            "templates": [[template.template_id, template.tokens, template.size]
+                          for template in self.templates],
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "TemplateMiner":
+        """Rebuild a miner — tree included — so a new run warm-starts from known templates."""
+        miner = cls(data["depth"], data["threshold"], data["max_children"])
+        for template_id, tokens, size in data["templates"]:
+            template = Template(template_id, tokens, size)
+            miner.templates.append(template)
+            miner._leaf(tokens).append(template)
+        return miner
+
+    def save(self, path: str) -> None:
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(self.to_dict(), file)
+
+    @classmethod
+    def load(cls, path: str) -> "TemplateMiner":
+        with open(path, "r", encoding="utf-8") as file:
+            return cls.from_dict(json.load(file))
+
+    def __len__(self) -> int:
+        return len(self.templates)
+
+
+def mine_file(filename: str, miner: TemplateMiner) -> int:
+    """Feed every message of the log to the miner; return how many were mined."""
+    count = 0
+    add = miner.add
+    for entry in log_reader(filename):
+        add(entry.message)
+        count += 1
+    return count
+
+
+# ─────────────────────────────────────────────
+#  Comparison functions
+# ─────────────────────────────────────────────
+@timer
+@memory_tracker
+def approach_templates(filename: str, miner: TemplateMiner) -> int:
+    """Mines templates from every message in one streaming pass."""
+    return mine_file(filename, miner)
+
+
+# ─────────────────────────────────────────────
+#  Run comparison
+# ─────────────────────────────────────────────
+FILE = "./datasets/Android.log"
+
+if __name__ == "__main__":
+    print("=" * 50)
+    print("  TEMPLATES  (Drain, cold start)")
+    print("=" * 50)
+    miner = TemplateMiner()
+    count = approach_templates(FILE, miner)
+    start = time.perf_counter()             # untraced rerun: tracemalloc skews lines/sec
+    mine_file(FILE, TemplateMiner())
+    elapsed = time.perf_counter() - start
+    print(f"  Entries mined     : {count}  ({count / elapsed:,.0f} lines/sec)")
+    print(f"  Templates found   : {len(miner)}")
+    for template in sorted(miner.templates, key=lambda item: item.size, reverse=True)[:5]:
+        print(f"    {template.size:>8}  {template}")
+    print()
+
+    miner.save(FILE + ".templates.json")
+    print("=" * 50)
+    print("  TEMPLATES  (warm start from saved templates)")
+    print("=" * 50)
+    miner = TemplateMiner.load(FILE + ".templates.json")
+    count = approach_templates(FILE, miner)
+    print(f"  Templates found   : {len(miner)}\n")
@@ -0,0 +1,55 @@
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from init import NO_TIME, log_reader
+from batch import LogBatch
+from bursts import BurstDetector
+from cache import open_cached
+
+LINES = [
+    "03-17 16:13:38.811  1702  2395 D WindowManager: printFreezingDisplayLogsopening",
+    "00-00 16:13:38.812  1702  2395 E WindowManager: no such day",
+    "04-31 16:13:38.813  1702  2395 E WindowManager: no such day either",
+    "03-17 16:13:38.814  1702  2395 I WindowManager: after",
+]
+
+
+class ImpossibleDateTest(unittest.TestCase):
+    """A line the parser accepts must never make the columnar path raise."""
+
+    def setUp(self):
+        folder = tempfile.TemporaryDirectory()
+        self.addCleanup(folder.cleanup)
+        self.path = os.path.join(folder.name, "dates.log")
+        with open(self.path, "w", encoding="utf-8") as file:
+            file.write("\n".join(LINES) + "\n")
+
+    def test_entry_epoch_is_sentinel(self):
+        entries = list(log_reader(self.path))
+        self.assertEqual(len(entries), 4)
+        self.assertEqual([entry.epoch_ms == NO_TIME for entry in entries], [False, True, True, False])
+
+    def test_batch_from_file(self):
+        batch = LogBatch.from_file(self.path)
+        self.assertEqual(len(batch), 4)
+        self.assertEqual(list(batch.epoch_ms), [entry.epoch_ms for entry in log_reader(self.path)])
+        self.assertEqual(batch.epoch_ms[3] - batch.epoch_ms[0], 3)
+
+    def test_open_cached(self):
+        with open_cached(self.path) as cached:
+            self.assertEqual(cached.rows, 4)
+            self.assertEqual(list(cached.epoch_ms), list(LogBatch.from_file(self.path).epoch_ms))
+
+    def test_bursts_clock(self):
+        detector = BurstDetector(min_count=1)
+        for entry in log_reader(self.path):
+            detector.add(entry)
+        self.assertEqual(detector.tags["WindowManager"].total, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,33 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from init import LogEntry
+from bursts import BurstDetector
+
+
+def _entry(date: str, time_: str) -> LogEntry:
+    return LogEntry(date=date, time=time_, pid=1, tid=1, level="E", tag="Radio", message="fail")
+
+
+class NewYearTest(unittest.TestCase):
+    """A log running from 12-31 into 01-01 must not jump back almost a year."""
+
+    def test_burst_across_midnight(self):
+        # 50 errors a second from 23:59:50 to 00:00:10, then quiet until a line at 00:01:00
+        stamps = [("12-31", f"23:59:{second:02d}.{ms:03d}") for second in range(50, 60) for ms in range(0, 1000, 20)]
+        stamps += [("01-01", f"00:00:{second:02d}.{ms:03d}") for second in range(10) for ms in range(0, 1000, 20)]
+        stamps.append(("01-01", "00:01:00.000"))
+        detector = BurstDetector()
+        events = [event for date, time_ in stamps for event in detector.add(_entry(date, time_))]
+        self.assertEqual([event.kind for event in events], ["start", "end"])
+        start, end = events
+        # the burst started before midnight and ended after it, one continuous run of errors
+        self.assertTrue(10_000 < end.epoch_ms - start.epoch_ms < 90_000)
+        self.assertEqual(end.total, 1000)
+
+
+if __name__ == "__main__":
+    unittest.main()
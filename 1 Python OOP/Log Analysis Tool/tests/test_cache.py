@@ -0,0 +1,41 @@
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import cache
+from batch import LogBatch
+
+LINE = "03-17 16:13:38.811  1702  2395 D WindowManager: printFreezingDisplayLogsopening\n"
+
+
+class GrowingLogTest(unittest.TestCase):
+
+    def setUp(self):
+        folder = tempfile.TemporaryDirectory()
+        self.addCleanup(folder.cleanup)
+        self.path = os.path.join(folder.name, "live.log")
+        with open(self.path, "w", encoding="utf-8") as file:
+            file.write(LINE * 10)
+
+    def test_growth_during_build_is_not_cached_as_fresh(self):
+        read = LogBatch.from_file
+
+        def read_then_grow(filename, *args):
+            batch = read(filename, *args)
+            with open(filename, "a", encoding="utf-8") as file:
+                file.write(LINE * 5)
+            return batch
+
+        with mock.patch.object(LogBatch, "from_file", side_effect=read_then_grow):
+            with cache.open_cached(self.path) as cached:
+                self.assertEqual(cached.rows, 10)
+        with cache.open_cached(self.path) as cached:
+            self.assertEqual(cached.rows, 15)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,53 @@
+import gzip
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from compressed import _ChunkReader, gzip_members, open_log
+
+LINE = b"03-17 16:13:38.811  1702  2395 D WindowManager: printFreezingDisplayLogsopening\n"
+
+
+class GzipMembersTest(unittest.TestCase):
+
+    def setUp(self):
+        folder = tempfile.TemporaryDirectory()
+        self.addCleanup(folder.cleanup)
+        self.path = os.path.join(folder.name, "log.gz")
+
+    def write(self, blob: bytes) -> None:
+        with open(self.path, "wb") as file:
+            file.write(blob)
+
+    def test_false_header_inside_one_member(self):
+        # a stored (level 0) member carries its payload verbatim, header bytes and all
+        payload = (LINE * 5000 + gzip.compress(LINE * 100)) * 5
+        self.write(gzip.compress(payload, compresslevel=0))
+        with open_log(self.path, workers=4) as file:
+            self.assertNotIsInstance(file.buffer.raw, _ChunkReader)
+            self.assertEqual(file.buffer.read(), payload)
+        self.assertEqual(b"".join(gzip_members(self.path, 4)), payload)
+
+    def test_real_members_read_in_parallel(self):
+        self.write(b"".join(gzip.compress(LINE * count) for count in (1000, 1, 5000)))
+        with open_log(self.path, workers=4) as file:
+            self.assertIsInstance(file.buffer.raw, _ChunkReader)
+            self.assertEqual(file.read().encode("utf-8"), LINE * 6001)
+
+    def test_zero_padding_ends_the_stream(self):
+        self.write(gzip.compress(LINE * 10) + b"\0" * 7 + gzip.compress(LINE) + b"\0" * 512)
+        self.assertEqual(b"".join(gzip_members(self.path, 4)), LINE * 11)
+        with open_log(self.path, workers=4) as file:
+            self.assertEqual(file.read().encode("utf-8"), LINE * 11)
+
+    def test_truncated_member_raises(self):
+        self.write(gzip.compress(LINE * 10) + gzip.compress(LINE * 10000)[:-20])
+        with self.assertRaises(EOFError):
+            b"".join(gzip_members(self.path, 4))
+
+
+if __name__ == "__main__":
+    unittest.main()
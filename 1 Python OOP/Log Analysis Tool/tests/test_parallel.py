@@ -0,0 +1,88 @@
+import gzip
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from init import log_reader
+from aggregate import parallel_aggregate
+from batch import LogBatch
+from cache import open_cached
+from export import parallel_export
+from extsort import sort_file
+from mmap_reader import mmap_reader
+from parallel import parallel_count, parallel_reader
+from search import SearchIndex
+from sketches import parallel_sketch
+
+LEVELS = "VDIWEF"
+
+
+def _lines(count: int):
+    for number in range(count):
+        yield (f"03-17 16:{number // 6000 % 60:02d}:{number // 100 % 60:02d}.{number % 1000:03d}  "
+               f"{1000 + number % 7}  {2000 + number % 13} {LEVELS[number % 6]} Tag{number % 5}: "
+               f"message {number}\n")
+        if number % 97 == 0:
+            yield "\tat com.example.Continuation.line(Unknown Source)\n"
+
+
+class CompressedLogTest(unittest.TestCase):
+    """Every byte-range and mmap entry point must give a .gz log the same answer as the plain one."""
+
+    def setUp(self):
+        folder = tempfile.TemporaryDirectory()
+        self.addCleanup(folder.cleanup)
+        self.folder = folder.name
+        self.plain = os.path.join(self.folder, "s.log")
+        with open(self.plain, "w", encoding="utf-8") as file:
+            file.writelines(_lines(3000))
+        self.packed = self.plain + ".gz"
+        with open(self.plain, "rb") as source, gzip.open(self.packed, "wb") as target:
+            shutil.copyfileobj(source, target)
+        self.entries = list(log_reader(self.plain))
+
+    def test_parallel_count(self):
+        self.assertEqual(parallel_count(self.packed, 2), len(self.entries))
+
+    def test_parallel_reader(self):
+        self.assertEqual(list(parallel_reader(self.packed, 2)), self.entries)
+        self.assertEqual(len(list(parallel_reader(self.packed, 2, ordered=False))), len(self.entries))
+
+    def test_parallel_aggregate(self):
+        expected = parallel_aggregate(self.plain, 2)
+        result = parallel_aggregate(self.packed, 2)
+        self.assertEqual(result.total.count, len(self.entries))
+        self.assertEqual(result.exact, expected.exact)
+
+    def test_parallel_sketch(self):
+        self.assertEqual(parallel_sketch(self.packed, 2).entries, len(self.entries))
+
+    def test_parallel_export(self):
+        result = parallel_export(self.packed, os.path.join(self.folder, "out.jsonl"), "jsonl", workers=2)
+        self.assertEqual(sum(result.rows), len(self.entries))
+
+    def test_sort_file(self):
+        self.assertEqual(list(sort_file(self.packed, "tag", workers=2)),
+                         list(sort_file(self.plain, "tag", workers=2)))
+
+    def test_mmap_reader(self):
+        self.assertEqual(list(mmap_reader(self.packed)), list(mmap_reader(self.plain)))
+        self.assertEqual(list(mmap_reader(self.packed, fields=("level", "tag"))),
+                         list(mmap_reader(self.plain, fields=("level", "tag"))))
+
+    def test_batch_and_cache(self):
+        self.assertEqual(len(LogBatch.from_file(self.packed)), len(self.entries))
+        with open_cached(self.packed) as cached:
+            self.assertEqual(list(cached), self.entries)
+
+    def test_search_index_refuses(self):
+        with self.assertRaises(ValueError):
+            SearchIndex.open(self.packed)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,42 @@
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from init import log_reader
+from sampling import sample
+
+TRACE = "\tat com.android.server.am.ActivityManagerService.handleMessage(ActivityManagerService.java:1234)\n"
+
+
+class SampleTest(unittest.TestCase):
+
+    def setUp(self):
+        folder = tempfile.TemporaryDirectory()
+        self.addCleanup(folder.cleanup)
+        self.path = os.path.join(folder.name, "traces.log")
+        with open(self.path, "w", encoding="utf-8") as file:
+            for number in range(500):
+                file.write(f"03-17 16:13:{number // 10 % 60:02d}.{number % 1000:03d}  1702  2395 "
+                           f"{'EW'[number % 2]} ActivityManager: crash {number}\n")
+                file.write(TRACE * 9)         # nine unparseable lines for every entry
+
+    def test_exactly_n_when_most_lines_do_not_parse(self):
+        entries = sample(self.path, 100, seed=7)
+        self.assertEqual(len(entries), 100)
+        numbers = [int(entry.message.split()[-1]) for entry in entries]
+        self.assertEqual(numbers, sorted(set(numbers)))
+
+    def test_all_entries_when_n_is_larger(self):
+        self.assertEqual(sample(self.path, 1000, seed=7), list(log_reader(self.path)))
+
+    def test_filters(self):
+        entries = sample(self.path, 300, seed=7, min_level="E")
+        self.assertEqual(len(entries), 250)
+        self.assertTrue(all(entry.level == "E" for entry in entries))
+
+
+if __name__ == "__main__":
+    unittest.main()
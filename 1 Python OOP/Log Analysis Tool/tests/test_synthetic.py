@@ -0,0 +1,37 @@
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from init import log_reader
+from synthetic import generate
+
+
+class GenerateTest(unittest.TestCase):
+
+    def setUp(self):
+        folder = tempfile.TemporaryDirectory()
+        self.addCleanup(folder.cleanup)
+        self.folder = folder.name
+        self.path = os.path.join(self.folder, "synthetic.log")
+
+    def test_exact_size_in_place(self):
+        for size in (1, 300, 1024 * 1024 + 7):
+            lines = generate(self.path, size, seed=1, workers=1)
+            self.assertEqual(os.path.getsize(self.path), size)
+            self.assertEqual(os.listdir(self.folder), ["synthetic.log"])
+            self.assertEqual(len(list(log_reader(self.path))), lines)
+
+    def test_same_file_for_any_worker_count(self):
+        generate(self.path, 256 * 1024, seed=5, workers=1)
+        with open(self.path, "rb") as file:
+            first = file.read()
+        generate(self.path, 256 * 1024, seed=5, workers=2)
+        with open(self.path, "rb") as file:
+            self.assertEqual(file.read(), first)
+
+
+if __name__ == "__main__":
+    unittest.main()
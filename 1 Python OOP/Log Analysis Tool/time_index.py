@@ -0,0 +1,240 @@
+import hashlib
+import os
+import struct
+from array import array
+from bisect import bisect_left
+from typing import Optional
+
+from init import timer, memory_tracker, log_reader
+
+SUFFIX = ".idx"
+MAGIC = b"LOGTIDX1"
+HEAD_BYTES = 64 * 1024
+
+# magic, source size, source mtime (ns), bytes indexed so far, block count, head digest
+_HEADER = struct.Struct("<8sQqQQ20s")
+
+
+def second_key(date: str, time: str = "") -> int:
+    """Turn 'MM-DD' and 'HH:MM:SS.mmm' (or a prefix of it) into a sortable per-second bucket."""
+    month, day = int(date[0:2]), int(date[3:5])
+    clock = [int(float(part)) for part in time.split(":")] if time else []
+    hours, minutes, seconds = (clock + [0, 0, 0])[:3]
+    return ((month * 32 + day) * 24 + hours) * 3600 + minutes * 60 + seconds
+
+
+def _line_key(line: bytes) -> Optional[int]:
+    parts = line.split(None, 2)
+    if len(parts) < 3:
+        return None
+    date, time = parts[0], parts[1]
+    if len(date) != 5 or date[2:3] != b"-" or len(time) < 8 or time[2:3] != b":" or time[5:6] != b":":
+        return None
+    try:
+        return second_key(date.decode("ascii"), time[:8].decode("ascii"))
+    except ValueError:
+        return None
+
+
+def head_digest(filename: str, size: int) -> bytes:
+    with open(filename, "rb") as file:
+        return hashlib.sha1(file.read(min(size, HEAD_BYTES))).digest()
+
+
+# ─────────────────────────────────────────────
+#  TimeIndex
+# ─────────────────────────────────────────────
+class TimeIndex:
+    """Sidecar mapping per-second time buckets to byte offsets in a log.
+
+    A new block starts at every line whose bucket is later than anything
+    seen before it, so every line in front of block j is older than
+    keys[j]. Each block also records the earliest bucket inside it, which
+    lets a range read stop early even when logcat writes a few lines out
+    of order.
+    """
+
+    ####################### Initialization #######################
+
+    def __init__(self, filename: str):
+        if not isinstance(filename, str):
+            raise TypeError("File name must be str.")
+        if not filename.strip():
+            raise ValueError("File name must not be empty.")
+        self.filename = filename
+        self.path = filename + SUFFIX
+        self.size = 0
+        self.mtime_ns = 0
+        self.indexed = 0                # bytes covered, always a line boundary
+        self.digest = b"\0" * 20
+        self.keys = array("I")          # running-max bucket at the block start
+        self.offsets = array("Q")       # byte offset of the block start
+        self.mins = array("I")          # earliest bucket inside the block
+        self._floors: Optional[array] = None
+
+    @classmethod
+    def open(cls, filename: str) -> "TimeIndex":
+        """Load the sidecar and bring it up to date with the source file."""
+        index = cls(filename)
+        if os.path.exists(index.path):
+            index.load()
+        index.refresh()
+        return index
+
+    ####################### Persistence #######################
+
+    def load(self) -> None:
+        with open(self.path, "rb") as file:
+            header = file.read(_HEADER.size)
+            if len(header) != _HEADER.size:
+                return
+            magic, size, mtime_ns, indexed, blocks, digest = _HEADER.unpack(header)
+            if magic != MAGIC:
+                return
+            keys, offsets, mins = array("I"), array("Q"), array("I")
+            try:
+                keys.fromfile(file, blocks)
+                offsets.fromfile(file, blocks)
+                mins.fromfile(file, blocks)
+            except EOFError:
+                return                  # torn write — treat as missing
+        self.size, self.mtime_ns, self.indexed, self.digest = size, mtime_ns, indexed, digest
+        self.keys, self.offsets, self.mins = keys, offsets, mins
+        self._floors = None
+
+    def save(self) -> None:
+        temporary = self.path + ".tmp"
+        with open(temporary, "wb") as file:
+            file.write(_HEADER.pack(MAGIC, self.size, self.mtime_ns, self.indexed,
+                                    len(self.keys), self.digest))
+            self.keys.tofile(file)
+            self.offsets.tofile(file)
+            self.mins.tofile(file)
+        os.replace(temporary, self.path)
+
+    ####################### Building #######################
+
+    def is_fresh(self) -> bool:
+        """True when the index covers the source as it is now: same size, mtime and head bytes."""
+        stat = os.stat(self.filename)
+        return (stat.st_size == self.size and stat.st_mtime_ns == self.mtime_ns
+                and head_digest(self.filename, self.size) == self.digest)
+
+    def refresh(self) -> bool:
+        """Rebuild or extend the index if the source changed; return True when it did.
+
+        A file that only grew (same size-or-larger, same head bytes) is
+        indexed from where the last run stopped; anything else starts over.
+        """
+        if self.is_fresh():
+            return False
+        stat = os.stat(self.filename)
+        grown = (self.size > 0 and stat.st_size >= self.size
+                 and head_digest(self.filename, self.size) == self.digest)
+        if not grown:
+            self.keys, self.offsets, self.mins = array("I"), array("Q"), array("I")
+            self.indexed = 0
+        self._scan()
+        self.size, self.mtime_ns = stat.st_size, stat.st_mtime_ns
+        self.digest = head_digest(self.filename, self.size)
+        self._floors = None
+        self.save()
+        return True
+
+    def _scan(self) -> None:
+        keys, offsets, mins = self.keys, self.offsets, self.mins
+        latest = keys[-1] if keys else -1
+        offset = self.indexed
+        with open(self.filename, "rb") as file:
+            file.seek(offset)
+            for line in file:
+                if not line.endswith(b"\n"):
+                    break               # still being written — index it next time
+                key = _line_key(line)
+                if key is not None:
+                    if key > latest:
+                        latest = key
+                        keys.append(key)
+                        offsets.append(offset)
+                        mins.append(key)
+                    elif key < mins[-1]:
+                        mins[-1] = key
+                offset += len(line)
+        self.indexed = offset
+
+    ####################### Lookup #######################
+
+    def byte_range(self, since: Optional[str] = None,
+                   until: Optional[str] = None) -> tuple[int, int]:
+        """Byte range that holds every line stamped inside [since, until)."""
+        start, end = 0, self.size
+        if since is not None:
+            date, _, time = since.strip().partition(" ")
+            block = bisect_left(self.keys, second_key(date, time.strip()))
+            start = self.offsets[block] if block < len(self.offsets) else self.indexed
+        if until is not None:
+            date, _, time = until.strip().partition(" ")
+            # Whole-second buckets: stop only once every later line is a full second past until.
+            block = bisect_left(self.floors, second_key(date, time.strip()) + 1)
+            if block < len(self.offsets):
+                end = self.offsets[block]
+        return start, max(start, end)
+
+    @property
+    def floors(self) -> array:
+        """Earliest bucket at or after each block — never decreasing, so it can be bisected."""
+        if self._floors is None:
+            floors = array("I", self.mins)
+            for block in range(len(floors) - 2, -1, -1):
+                if floors[block + 1] < floors[block]:
+                    floors[block] = floors[block + 1]
+            self._floors = floors
+        return self._floors
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def __repr__(self) -> str:
+        return f"TimeIndex(filename={self.filename!r}, blocks={len(self)}, indexed={self.indexed})"
+
+
+# ─────────────────────────────────────────────
+#  Comparison functions
+# ─────────────────────────────────────────────
+@timer
+@memory_tracker
+def approach_scan_range(filename: str, since: str, until: str) -> int:
+    """Reads from the top of the file and filters every line on its timestamp."""
+    return sum(1 for _ in log_reader(filename, since=since, until=until))
+
+
+@timer
+@memory_tracker
+def approach_indexed_range(filename: str, since: str, until: str) -> int:
+    """Seeks straight to the range through the sidecar index."""
+    return sum(1 for _ in log_reader(filename, since=since, until=until, index=True))
+
+
+# ─────────────────────────────────────────────
+#  Run comparison
+# ─────────────────────────────────────────────
+FILE = "./datasets/Android.log"
+
+if __name__ == "__main__":
+    index = TimeIndex.open(FILE)
+    print(f"  {index}\n")
+    first = next(log_reader(FILE))
+    since = f"{first.date} {first.time[:5]}:30"
+    until = f"{first.date} {first.time[:5]}:31"
+
+    print("=" * 50)
+    print(f"  FULL SCAN  ({since} → {until})")
+    print("=" * 50)
+    count = approach_scan_range(FILE, since, until)
+    print(f"  Entries in range  : {count}\n")
+
+    print("=" * 50)
+    print(f"  INDEXED  ({since} → {until})")
+    print("=" * 50)
+    count = approach_indexed_range(FILE, since, until)
+    print(f"  Entries in range  : {count}\n")
@@ -0,0 +1,282 @@
+import os
+import shutil
+import tempfile
+from array import array
+from bisect import bisect_right
+from collections import OrderedDict
+from typing import Optional
+
+from init import LogEntry, timer, memory_tracker, log_reader
+
+DEFAULT_BUDGET = 64 * 1024 * 1024
+ENTRY_OVERHEAD = 56             # rough cost of a small str object beyond its characters
+SPARSE_EVERY = 64               # one byte offset kept per this many spilled entries
+
+
+# ─────────────────────────────────────────────
+#  Spill file
+# ─────────────────────────────────────────────
+class SpillFile:
+    """One append-only file shared by every timeline, so a spill is a single buffered write."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "ab+")
+        self.size = 0
+
+    def append(self, data: bytes) -> int:
+        offset = self.size
+        self._file.write(data)
+        self.size += len(data)
+        return offset
+
+    def reader(self):
+        """A separate read handle, opened after flushing pending writes."""
+        self._file.flush()
+        return open(self.path, "rb")
+
+    def close(self) -> None:
+        self._file.close()
+
+
+# ─────────────────────────────────────────────
+#  Timeline
+# ─────────────────────────────────────────────
+class Timeline:
+    """Every entry of one (pid, tid) in log order: spilled runs followed by an in-memory tail.
+
+    Each spilled run is contiguous in the shared spill file. A sparse
+    table records (entry index, byte offset) at the start of every run and
+    every SPARSE_EVERY entries inside it, so reaching entry i reads at most
+    SPARSE_EVERY lines from disk.
+    """
+
+    def __init__(self, key: tuple[int, int], store: SpillFile):
+        self.key = key
+        self.store = store
+        self.buffer: list[str] = []
+        self.buffered_bytes = 0
+        self.spilled = 0
+        self._points = array("Q")       # entry index of each sparse point
+        self._offsets = array("Q")      # byte offset of that entry in the spill file
+
+    def spill(self) -> int:
+        """Append the in-memory tail to the spill file; return the bytes freed."""
+        if not self.buffer:
+            return 0
+        data = [(line + "\n").encode("utf-8") for line in self.buffer]
+        offset = self.store.append(b"".join(data))
+        index = self.spilled
+        for number, chunk in enumerate(data):
+            if number == 0 or index % SPARSE_EVERY == 0:
+                self._points.append(index)
+                self._offsets.append(offset)
+            offset += len(chunk)
+            index += 1
+        freed = self.buffered_bytes
+        self.spilled = index
+        self.buffer = []
+        self.buffered_bytes = 0
+        return freed
+
+    def _read_spilled(self, start: int, stop: int):
+        """Spilled lines start..stop-1, one contiguous read per sparse segment."""
+        points, offsets = self._points, self._offsets
+        point = bisect_right(points, start) - 1
+        with self.store.reader() as file:
+            while start < stop:
+                segment_end = min(points[point + 1] if point + 1 < len(points) else self.spilled,
+                                  stop)
+                file.seek(offsets[point])
+                for _ in range(start - points[point]):
+                    file.readline()
+                for _ in range(segment_end - start):
+                    yield file.readline().decode("utf-8").rstrip("\n")
+                start = segment_end
+                point += 1
+
+    ####################### Magic Methods #######################
+
+    def __len__(self) -> int:
+        return self.spilled + len(self.buffer)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step != 1:
+                return [self[position] for position in range(start, stop, step)]
+            return [LogEntry.parse(line) for line in self._lines(start, stop)]
+        if not isinstance(index, int) or isinstance(index, bool):
+            raise TypeError("Index must be an integer.")
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("Timeline index out of range.")
+        if index >= self.spilled:
+            return LogEntry.parse(self.buffer[index - self.spilled])
+        return LogEntry.parse(next(iter(self._read_spilled(index, index + 1))))
+
+    def _lines(self, start: int, stop: int):
+        if start < self.spilled:
+            yield from self._read_spilled(start, min(stop, self.spilled))
+        yield from self.buffer[max(start - self.spilled, 0):max(stop - self.spilled, 0)]
+
+    def __iter__(self):
+        parse = LogEntry.parse
+        for line in self._lines(0, len(self)):
+            yield parse(line)
+
+    def __repr__(self) -> str:
+        return (f"Timeline(pid={self.key[0]}, tid={self.key[1]}, entries={len(self)}, "
+                f"spilled={self.spilled})")
+
+
+# ─────────────────────────────────────────────
+#  Timelines
+# ─────────────────────────────────────────────
+class Timelines:
+    """Split an interleaved entry stream into per-thread timelines under a memory budget.
+
+    Recent entries stay in memory; whenever the buffered total passes
+    `budget` bytes, the least recently active threads are spilled to a
+    shared temporary file until it fits again. Memory therefore stays near
+    the budget plus a few bytes per spilled entry, however large the log.
+    The spill file is removed by close() or on leaving a with-block.
+    """
+
+    def __init__(self, budget: int = DEFAULT_BUDGET, folder: Optional[str] = None):
+        if not isinstance(budget, int) or isinstance(budget, bool):
+            raise TypeError("Budget must be an integer number of bytes.")
+        if budget < 0:
+            raise ValueError("Budget must not be negative.")
+        self.budget = budget
+        self.folder = tempfile.mkdtemp(prefix="timelines-", dir=folder)
+        self.store = SpillFile(os.path.join(self.folder, "spill.log"))
+        self.timelines: dict[tuple[int, int], Timeline] = {}
+        self._active: OrderedDict = OrderedDict()      # threads with a buffer, least recent first
+        self.buffered_bytes = 0
+        self.spills = 0
+
+    @classmethod
+    def from_file(cls, filename: str, budget: int = DEFAULT_BUDGET,
+                  folder: Optional[str] = None, **filters) -> "Timelines":
+        timelines = cls(budget, folder)
+        timelines.consume(log_reader(filename, **filters))
+        return timelines
+
+    ####################### Building #######################
+
+    def add(self, entry: LogEntry) -> None:
+        key = (entry.pid, entry.tid)
+        timeline = self.timelines.get(key)
+        if timeline is None:
+            timeline = self.timelines[key] = Timeline(key, self.store)
+        line = entry.to_line()
+        size = len(line) + ENTRY_OVERHEAD
+        timeline.buffer.append(line)
+        timeline.buffered_bytes += size
+        self.buffered_bytes += size
+        active = self._active
+        if key in active:
+            active.move_to_end(key)
+        else:
+            active[key] = timeline
+        if self.buffered_bytes > self.budget:
+            self._spill()
+
+    def consume(self, entries) -> "Timelines":
+        add = self.add
+        for entry in entries:
+            add(entry)
+        return self
+
+    def _spill(self) -> None:
+        # spill down to three quarters of the budget so spills come in batches
+        target = self.budget * 3 // 4
+        active = self._active
+        while self.buffered_bytes > target and active:
+            _, timeline = active.popitem(last=False)
+            self.buffered_bytes -= timeline.spill()
+            self.spills += 1
+
+    ####################### Access #######################
+
+    def threads(self) -> list[tuple[int, int]]:
+        return list(self.timelines)
+
+    def timeline(self, pid: int, tid: int) -> Timeline:
+        try:
+            return self.timelines[(pid, tid)]
+        except KeyError:
+            raise KeyError(f"No entries for pid {pid}, tid {tid}.") from None
+
+    def close(self) -> None:
+        self.timelines.clear()
+        self._active.clear()
+        self.buffered_bytes = 0
+        self.store.close()
+        shutil.rmtree(self.folder, ignore_errors=True)
+
+    ####################### Magic Methods #######################
+
+    def __getitem__(self, key: tuple[int, int]) -> Timeline:
+        pid, tid = key
+        return self.timeline(pid, tid)
+
+    def __contains__(self, key) -> bool:
+        return key in self.timelines
+
+    def __len__(self) -> int:
+        return len(self.timelines)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __repr__(self) -> str:
+        return (f"Timelines(threads={len(self.timelines)}, buffered={self.buffered_bytes}, "
+                f"budget={self.budget}, spills={self.spills})")
+
+
+# ─────────────────────────────────────────────
+#  Comparison functions
+# ─────────────────────────────────────────────
+@timer
+@memory_tracker
+def approach_group_in_memory(filename: str) -> int:
+    """Groups every LogEntry into a dict of lists — full file in RAM."""
+    groups: dict[tuple[int, int], list[LogEntry]] = {}
+    for entry in log_reader(filename):
+        groups.setdefault((entry.pid, entry.tid), []).append(entry)
+    return len(groups)
+
+
+@timer
+@memory_tracker
+def approach_timelines(filename: str, budget: int) -> int:
+    """Groups through Timelines, spilling idle threads to disk past the budget."""
+    with Timelines.from_file(filename, budget=budget) as timelines:
+        busiest = max(timelines.timelines.values(), key=len)
+        busiest[len(busiest) // 2]          # random access into the spilled part
+        return len(timelines)
+
+
+# ─────────────────────────────────────────────
+#  Run comparison
+# ─────────────────────────────────────────────
+FILE = "./datasets/Android.log"
+
+if __name__ == "__main__":
+    print("=" * 50)
+    print("  GROUP IN MEMORY  (dict of LogEntry lists)")
+    print("=" * 50)
+    count = approach_group_in_memory(FILE)
+    print(f"  Threads           : {count}\n")
+
+    print("=" * 50)
+    print("  TIMELINES  (1 MB budget, LRU spill to disk)")
+    print("=" * 50)
+    count = approach_timelines(FILE, 1024 * 1024)
+    print(f"  Threads           : {count}\n")